@@ -0,0 +1,28 @@
+from fastapi import Request, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import get_db
+from app.auth.router import get_session_user_id
+from app.auth.oauth import get_user_by_id
+
+
+async def get_current_user(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    """Get current authenticated user or None."""
+    user_id = get_session_user_id(request)
+    if not user_id:
+        return None
+    return await get_user_by_id(db, user_id)
+
+
+async def require_auth(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    """Require authenticated user or redirect to login."""
+    user = await get_current_user(request, db)
+    if not user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return user
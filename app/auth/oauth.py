@@ -1,19 +1,22 @@
 from datetime import datetime, timedelta
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import Flow
-from google.auth.transport.requests import Request
+from typing import TYPE_CHECKING
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-import httpx
 
 from app.config import get_settings
 from app.db.models import User
 
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import Flow
+
 settings = get_settings()
 
 
-def create_oauth_flow() -> Flow:
+def create_oauth_flow() -> "Flow":
     """Create Google OAuth flow."""
+    from google_auth_oauthlib.flow import Flow
+
     client_config = {
         "web": {
             "client_id": settings.google_client_id,
@@ -48,6 +51,8 @@ async def exchange_code_for_tokens(code: str) -> dict:
     Exchange authorization code for tokens.
     Returns user info and tokens.
     """
+    import httpx
+
     flow = create_oauth_flow()
     flow.fetch_token(code=code)
 
@@ -111,6 +116,9 @@ async def get_user_by_id(db: AsyncSession, user_id: int) -> User | None:
 
 async def refresh_access_token(user: User, db: AsyncSession) -> str:
     """Refresh the access token if expired."""
+    from google.oauth2.credentials import Credentials
+    from google.auth.transport.requests import Request
+
     if not user.refresh_token:
         raise ValueError("No refresh token available")
 
@@ -131,8 +139,10 @@ async def refresh_access_token(user: User, db: AsyncSession) -> str:
     return user.access_token
 
 
-def get_credentials_for_user(user: User) -> Credentials:
+def get_credentials_for_user(user: User) -> "Credentials":
     """Get Google credentials object for a user."""
+    from google.oauth2.credentials import Credentials
+
     return Credentials(
         token=user.access_token,
         refresh_token=user.refresh_token,
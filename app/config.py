@@ -1,4 +1,4 @@
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
 
 
@@ -8,6 +8,7 @@ class Settings(BaseSettings):
     # Application
     secret_key: str
     debug: bool = False
+    warm_imports_on_startup: bool = True
 
     # Google OAuth
     google_client_id: str
@@ -17,12 +18,78 @@ class Settings(BaseSettings):
     # Anthropic
     anthropic_api_key: str
 
+    # Model call scheduling (shared across all users of the API key)
+    model_max_concurrency: int = 4
+    scheduler_quantum_tokens: int = 4000
+    interactive_max_emails: int = 10
+
+    # Model call timeouts and retries; batches that still fail fall back
+    # to extractive summaries
+    model_timeout_seconds: float = 30.0
+    model_max_retries: int = 2
+    model_retry_base_delay: float = 1.0
+    model_fallback_enabled: bool = True
+
+    # Model routing by email size: trivial emails get an extractive summary,
+    # long emails or long summaries use the standard model
+    model_fast: str = "claude-3-haiku-20240307"
+    model_standard: str = "claude-3-haiku-20240307"
+    trivial_max_chars: int = 280
+    receipt_max_chars: int = 1500
+    standard_min_chars: int = 2000
+    standard_min_lines: int = 5
+    tokens_per_summary_line: int = 50
+
+    # Strip boilerplate (footers, disclaimers, reply chains) before prompting
+    compact_bodies: bool = True
+
+    # Long emails are split into sections that are condensed in parallel
+    # before the batch summary, instead of being truncated
+    long_email_mode: bool = True
+    long_email_threshold: int = 3000
+    chunk_size: int = 2500
+    max_chunk_size: int = 40000
+    max_chunks_per_email: int = 4
+    chunk_summary_tokens: int = 120
+
+    # Shared model rate limits across all workers (0 disables a limit)
+    model_requests_per_minute: int = 0
+    model_tokens_per_minute: int = 0
+
+    # Shared state for caches, rate limits, job queues and locks: "memory"
+    # for a single worker, "redis" to share it across workers and nodes
+    state_backend: str = "memory"
+    redis_url: str = "redis://localhost:6379/0"
+    summary_cache_ttl_seconds: int = 86400
+    singleflight_lock_seconds: int = 300
+
+    # Gmail API deadlines and retries; a positive hedge delay sends a second
+    # copy of slow message and thread reads
+    gmail_timeout_seconds: float = 20.0
+    gmail_max_retries: int = 2
+    gmail_retry_base_delay: float = 0.5
+    gmail_hedge_delay_seconds: float = 0.0
+
+    # Circuit breakers and retry budgets (per dependency and worker)
+    circuit_failure_threshold: int = 5
+    circuit_reset_seconds: float = 30.0
+    retry_budget_ratio: float = 0.2
+    retry_budget_min: int = 10
+
     # Database
     database_url: str = "sqlite+aiosqlite:///./email_summarizer.db"
 
     # Token encryption
     token_encryption_key: str
 
+    # Pre-summarization of watched senders (hours are UTC)
+    watch_scheduler_enabled: bool = True
+    watch_offpeak_start_hour: int = 1
+    watch_offpeak_end_hour: int = 6
+    watch_sync_interval_minutes: int = 720
+    watch_poll_seconds: int = 300
+    watch_max_emails: int = 25
+
     # Gmail API scopes
     gmail_scopes: list[str] = [
         "openid",
@@ -31,9 +98,12 @@ class Settings(BaseSettings):
         "https://www.googleapis.com/auth/userinfo.profile",
     ]
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
+    # Fields such as model_fast would clash with pydantic's "model_" namespace
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        protected_namespaces=("settings_",),
+    )
 
 
 @lru_cache
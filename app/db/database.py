@@ -14,6 +14,20 @@ engine = create_async_engine(settings.database_url, echo=settings.debug)
 async_session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
+def insert_ignoring_conflicts(model):
+    """
+    Build an INSERT that skips rows violating a unique constraint.
+
+    Lets concurrent runs store the same rows without failing on the
+    constraint. Supported on SQLite and PostgreSQL.
+    """
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model).on_conflict_do_nothing()
+
+
 async def init_db():
     """Initialize the database, creating all tables."""
     async with engine.begin() as conn:
@@ -1,15 +1,20 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Text
-from cryptography.fernet import Fernet
+from typing import TYPE_CHECKING
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, UniqueConstraint
 import base64
 import hashlib
 
 from app.db.database import Base
 from app.config import get_settings
 
+if TYPE_CHECKING:
+    from cryptography.fernet import Fernet
 
-def get_fernet() -> Fernet:
+
+def get_fernet() -> "Fernet":
     """Get Fernet instance for encryption/decryption."""
+    from cryptography.fernet import Fernet
+
     settings = get_settings()
     # Derive a valid Fernet key from the encryption key
     key = hashlib.sha256(settings.token_encryption_key.encode()).digest()
@@ -67,3 +72,49 @@ class User(Base):
             self._refresh_token = fernet.encrypt(value.encode()).decode()
         else:
             self._refresh_token = None
+
+
+class WatchedSender(Base):
+    """Sender whose emails are summarized ahead of time for a user."""
+    __tablename__ = "watched_senders"
+    __table_args__ = (UniqueConstraint("user_id", "sender_email"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
+    sender_email = Column(String(255), nullable=False)
+    num_lines = Column(Integer, nullable=False, default=2)
+    last_synced_at = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class SummaryRecord(Base):
+    """Stored summary of a single email."""
+    __tablename__ = "summaries"
+    __table_args__ = (UniqueConstraint("user_id", "message_id", "num_lines"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
+    sender_email = Column(String(255), index=True, nullable=False)
+    message_id = Column(String(255), nullable=False)
+    num_lines = Column(Integer, nullable=False)
+
+    subject = Column(Text, nullable=False, default="")
+    date = Column(String(64), nullable=False, default="")
+    snippet = Column(Text, nullable=False, default="")
+    summary = Column(Text, nullable=False)
+    received_at = Column(DateTime, index=True, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class IndexedEmail(Base):
+    """Email in the full-text search index; its ID is the index row ID."""
+    __tablename__ = "indexed_emails"
+    __table_args__ = (UniqueConstraint("user_id", "message_id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
+    message_id = Column(String(255), nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
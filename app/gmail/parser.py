@@ -1,17 +1,56 @@
+import re
 import base64
-from bs4 import BeautifulSoup
 from email.utils import parsedate_to_datetime
 
+# Start of the quoted history in a reply ("On <date>, <name> wrote:" etc.);
+# shared with body compaction through find_reply_header
+_REPLY_HEADER = re.compile(
+    r"^(?:On .{1,200}wrote:\s*$"
+    r"|-{2,}\s*Original Message\s*-{2,}"
+    r"|From: .+\n(?:Sent|Date): .+)",
+    re.IGNORECASE | re.MULTILINE,
+)
 
-def extract_email_content(message: dict) -> dict:
+# Start of a forwarded message; its From:/Date: lines are not a reply header.
+FORWARD_MARKER = re.compile(
+    r"^(?:-{2,}\s*Forwarded message\s*-{2,}|Begin forwarded message:)",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def find_reply_header(text: str) -> re.Match | None:
+    """
+    Find the header that starts the quoted history of a reply.
+
+    Headers inside a forwarded message (after a "Forwarded message"
+    marker) belong to the forwarded content and are not matched.
+    """
+    forward = FORWARD_MARKER.search(text)
+    end = forward.start() if forward else len(text)
+    return _REPLY_HEADER.search(text, 0, end)
+
+
+# Lines shorter than this ("Thanks,", "Hi Bob") are never treated as repeats.
+MIN_REPEATED_LINE_LENGTH = 20
+
+# Prefix of thread IDs, which share the ID space of message IDs
+THREAD_ID_PREFIX = "thread:"
+
+# Body part types, most preferred first; other text types rank after these.
+BODY_PREFERENCE = ("text/plain", "text/html")
+
+
+def extract_email_content(message: dict, attachment_data: dict[str, str] | None = None) -> dict:
     """
     Extract relevant content from a Gmail API message.
 
     Args:
         message: Raw message from Gmail API
+        attachment_data: Base64 data of bodies stored separately, keyed by
+            attachment ID (see ``find_body_part``)
 
     Returns:
-        Dictionary with subject, date, sender, and body
+        Dictionary with subject, date, timestamp, sender, and body
     """
     headers = message.get("payload", {}).get("headers", [])
 
@@ -35,10 +74,17 @@ def extract_email_content(message: dict) -> dict:
             sender = value
 
     # Extract body
-    body = extract_body(message.get("payload", {}))
+    body = extract_body(message.get("payload", {}), attachment_data)
+
+    # internalDate is the receive time in epoch milliseconds
+    try:
+        timestamp = int(message.get("internalDate", 0)) // 1000
+    except (TypeError, ValueError):
+        timestamp = 0
 
     return {
         "id": message.get("id"),
+        "timestamp": timestamp,
         "subject": subject,
         "date": date,
         "sender": sender,
@@ -47,49 +93,196 @@ def extract_email_content(message: dict) -> dict:
     }
 
 
-def extract_body(payload: dict) -> str:
+def extract_thread_content(thread: dict, attachment_data: dict[str, str] | None = None) -> dict:
+    """
+    Extract a Gmail API thread as a single document.
+
+    Messages are joined oldest first. Quoted history is removed from every
+    message, and lines that already appeared earlier in the thread are
+    dropped, so each piece of text is kept once.
+
+    Args:
+        thread: Raw thread from Gmail API (format=full)
+        attachment_data: Base64 data of bodies stored separately, keyed by
+            attachment ID
+
+    Returns:
+        Dictionary shaped like ``extract_email_content`` output, with the
+        subject of the first message, the date of the latest one,
+        ``message_count`` and the de-duplicated ``thread_messages``
+    """
+    messages = [
+        extract_email_content(message, attachment_data)
+        for message in thread.get("messages", [])
+    ]
+    messages.sort(key=lambda message: message["timestamp"])
+
+    seen_lines = set()
+    thread_messages = []
+    for message in messages:
+        body = message["body"]
+        reply_header = find_reply_header(body)
+        if reply_header and body[:reply_header.start()].strip():
+            body = body[:reply_header.start()]
+
+        lines = []
+        for line in body.splitlines():
+            stripped = line.strip()
+            if stripped.startswith(">"):
+                continue
+            key = " ".join(stripped.lower().split())
+            if len(key) >= MIN_REPEATED_LINE_LENGTH:
+                if key in seen_lines:
+                    continue
+                seen_lines.add(key)
+            lines.append(stripped)
+
+        text = "\n".join(lines).strip()
+        if text:
+            thread_messages.append({
+                "sender": message["sender"],
+                "date": message["date"],
+                "body": text,
+            })
+
+    first = messages[0] if messages else {}
+    latest = messages[-1] if messages else {}
+    return {
+        "id": f"{THREAD_ID_PREFIX}{thread.get('id')}",
+        "timestamp": latest.get("timestamp", 0),
+        "subject": first.get("subject", ""),
+        "date": latest.get("date", ""),
+        "sender": first.get("sender", ""),
+        "body": format_thread_body(thread_messages),
+        "snippet": latest.get("snippet", thread.get("snippet", "")),
+        "message_count": len(messages),
+        "thread_messages": thread_messages,
+    }
+
+
+def format_thread_body(thread_messages: list[dict]) -> str:
+    """Join de-duplicated thread messages into one body, oldest first."""
+    return "\n\n".join(
+        f"From: {message['sender']} ({message['date']})\n{message['body']}"
+        for message in thread_messages
+    )
+
+
+def is_attachment(part: dict) -> bool:
+    """Whether a MIME part is an attachment rather than message text."""
+    if part.get("filename"):
+        return True
+    for header in part.get("headers", []):
+        if header.get("name", "").lower() == "content-disposition":
+            return header.get("value", "").strip().lower().startswith("attachment")
+    return False
+
+
+def _body_rank(mime_type: str) -> int | None:
+    if mime_type in BODY_PREFERENCE:
+        return BODY_PREFERENCE.index(mime_type)
+    if mime_type.startswith("text/") or not mime_type:
+        return len(BODY_PREFERENCE)
+    return None
+
+
+def find_body_part(payload: dict, inline_only: bool = False) -> dict | None:
+    """
+    Find the MIME part holding the best text body of a message.
+
+    Walks the MIME tree once, iteratively and in document order, skipping
+    attachments. Text parts are ranked by ``BODY_PREFERENCE`` (other text
+    types last) and the earliest part of the best rank wins, however deeply
+    it is nested.
+
+    Args:
+        payload: Message payload from Gmail API
+        inline_only: Only consider parts whose data is in the payload, not
+            stored separately under an ``attachmentId``
+
+    Returns:
+        The winning part, or None if the message has no text
+    """
+    best = None
+    best_rank = None
+    stack = [payload]
+    while stack:
+        part = stack.pop()
+        mime_type = part.get("mimeType", "").lower()
+        if mime_type.startswith("multipart/"):
+            # Reversed so that parts are popped in document order
+            stack.extend(reversed(part.get("parts", [])))
+            continue
+
+        # Cheap checks first; attachment headers are only read for parts
+        # that would win
+        body = part.get("body", {})
+        if not body.get("data") and (inline_only or not body.get("attachmentId")):
+            continue
+        rank = _body_rank(mime_type)
+        if rank is None or (best_rank is not None and rank >= best_rank):
+            continue
+        if is_attachment(part):
+            continue
+
+        best, best_rank = part, rank
+        if rank == 0:
+            break
+
+    return best
+
+
+def decode_part(part: dict, attachment_data: dict[str, str] | None = None) -> str:
+    """
+    Decode the text of a MIME part, converting HTML to plain text.
+
+    Args:
+        part: MIME part from Gmail API
+        attachment_data: Base64 data of bodies stored separately, keyed by
+            attachment ID
+
+    Returns:
+        The text, or an empty string if its data is not available
+    """
+    body = part.get("body", {})
+    data = body.get("data")
+    if not data and attachment_data:
+        data = attachment_data.get(body.get("attachmentId"))
+    if not data:
+        return ""
+
+    text = decode_base64(data)
+    if "html" in part.get("mimeType", "").lower():
+        text = html_to_text(text)
+    return text
+
+
+def extract_body(payload: dict, attachment_data: dict[str, str] | None = None) -> str:
     """
     Extract plain text body from email payload.
-    Handles multipart messages and HTML content.
+
+    Only the best body part (see ``find_body_part``) is decoded. If that
+    part is stored under an ``attachmentId`` that was not fetched (see
+    ``attachment_data``), the best part with inline data is used instead.
+
+    Args:
+        payload: Message payload from Gmail API
+        attachment_data: Base64 data of bodies stored separately, keyed by
+            attachment ID
+
+    Returns:
+        Plain text body, or an empty string if the message has no text
     """
-    body_text = ""
-
-    # Check for direct body data
-    if "body" in payload and payload["body"].get("data"):
-        body_text = decode_base64(payload["body"]["data"])
-        mime_type = payload.get("mimeType", "")
-        if "html" in mime_type:
-            body_text = html_to_text(body_text)
-        return body_text
-
-    # Handle multipart messages
-    parts = payload.get("parts", [])
-    if not parts:
-        return body_text
-
-    # First, try to find plain text part
-    for part in parts:
-        mime_type = part.get("mimeType", "")
-        if mime_type == "text/plain":
-            if part.get("body", {}).get("data"):
-                return decode_base64(part["body"]["data"])
-
-    # Fall back to HTML part
-    for part in parts:
-        mime_type = part.get("mimeType", "")
-        if mime_type == "text/html":
-            if part.get("body", {}).get("data"):
-                html_content = decode_base64(part["body"]["data"])
-                return html_to_text(html_content)
-
-    # Handle nested multipart
-    for part in parts:
-        if part.get("mimeType", "").startswith("multipart/"):
-            nested_body = extract_body(part)
-            if nested_body:
-                return nested_body
-
-    return body_text
+    part = find_body_part(payload)
+    if part is None:
+        return ""
+
+    text = decode_part(part, attachment_data)
+    if not text and not part.get("body", {}).get("data"):
+        fallback = find_body_part(payload, inline_only=True)
+        if fallback is not None:
+            text = decode_part(fallback)
+    return text
 
 
 def decode_base64(data: str) -> str:
@@ -104,6 +297,8 @@ def decode_base64(data: str) -> str:
 
 def html_to_text(html: str) -> str:
     """Convert HTML to plain text."""
+    from bs4 import BeautifulSoup
+
     try:
         soup = BeautifulSoup(html, "html.parser")
 
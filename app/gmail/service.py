@@ -1,14 +1,48 @@
-from googleapiclient.discovery import build
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
+import asyncio
+import logging
+from datetime import datetime, timezone
 
+from app.config import get_settings
 from app.db.models import User
 from app.auth.oauth import get_credentials_for_user
-from app.gmail.parser import extract_email_content
+from app.gmail.parser import extract_email_content, extract_thread_content, find_body_part
+from app.metrics import metrics
+from app.resilience import CircuitBreaker, RetryBudget, call_with_retries, hedged
+from app.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Concurrent fetches of the same message or thread share one API call
+_message_flight = SingleFlight("gmail_message")
+_thread_flight = SingleFlight("gmail_thread")
+
+# Shared by all Gmail calls of this process
+_gmail_breaker = CircuitBreaker(
+    "gmail",
+    failure_threshold=settings.circuit_failure_threshold,
+    reset_timeout=settings.circuit_reset_seconds,
+)
+_gmail_budget = RetryBudget(
+    "gmail",
+    ratio=settings.retry_budget_ratio,
+    min_retries=settings.retry_budget_min,
+)
+
+# HTTP statuses worth retrying: rate limits and server errors
+TRANSIENT_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Requests per batch call; Gmail recommends at most 50
+BATCH_SIZE = 50
 
 
 async def get_gmail_service(user: User):
     """Build Gmail API service for a user."""
+    # Imported lazily: the Google client libraries are slow to import and
+    # are not needed until the first Gmail call.
+    from googleapiclient.discovery import build
+    from google.auth.transport.requests import Request
+
     credentials = get_credentials_for_user(user)
 
     # Refresh if expired
@@ -18,10 +52,166 @@ async def get_gmail_service(user: User):
     return build("gmail", "v1", credentials=credentials)
 
 
+def is_transient_error(error: Exception) -> bool:
+    """Whether a Gmail API error is worth retrying (rate limit, 5xx, network)."""
+    from googleapiclient.errors import HttpError
+
+    if isinstance(error, HttpError):
+        return error.resp.status in TRANSIENT_STATUSES
+    return isinstance(error, OSError)
+
+
+async def _execute_once(request, credentials=None):
+    # httplib2 connections are not thread-safe, so each call gets its own
+    # authorized connection using the credentials of the request. Its
+    # socket timeout frees the thread of a call abandoned at its deadline.
+    import httplib2
+    import google_auth_httplib2
+
+    http = google_auth_httplib2.AuthorizedHttp(
+        credentials or request.http.credentials,
+        http=httplib2.Http(timeout=settings.gmail_timeout_seconds),
+    )
+    return await asyncio.to_thread(request.execute, http=http)
+
+
+async def execute_request(request, hedge: bool = False):
+    """
+    Execute a Gmail API request in a worker thread.
+
+    Each attempt has a ``gmail_timeout_seconds`` deadline, and rate limits,
+    server errors and timeouts are retried with backoff within the Gmail
+    retry budget. Repeated failures open the Gmail circuit breaker, after
+    which calls fail fast with ``CircuitOpenError``.
+
+    Args:
+        request: Gmail API request
+        hedge: Send a second copy of the request if the first has not
+            answered within ``gmail_hedge_delay_seconds`` (reads only)
+    """
+    if hedge and settings.gmail_hedge_delay_seconds > 0:
+        def attempt():
+            return hedged(
+                lambda: _execute_once(request),
+                settings.gmail_hedge_delay_seconds,
+                "gmail",
+            )
+    else:
+        def attempt():
+            return _execute_once(request)
+
+    return await call_with_retries(
+        attempt,
+        "gmail",
+        is_transient_error,
+        max_retries=settings.gmail_max_retries,
+        base_delay=settings.gmail_retry_base_delay,
+        timeout=settings.gmail_timeout_seconds,
+        budget=_gmail_budget,
+        breaker=_gmail_breaker,
+    )
+
+
+async def execute_batch(service, requests: list) -> list:
+    """
+    Execute Gmail API requests as one batch call.
+
+    The batch is retried as a whole like a single request (see
+    ``execute_request``), so only batch idempotent reads.
+
+    Returns:
+        The response or exception of each request, in order
+    """
+    results = [None] * len(requests)
+
+    def store_result(request_id, response, exception):
+        results[int(request_id)] = exception if exception is not None else response
+
+    def attempt():
+        batch = service.new_batch_http_request(callback=store_result)
+        for index, request in enumerate(requests):
+            batch.add(request, request_id=str(index))
+        return _execute_once(batch, credentials=requests[0].http.credentials)
+
+    await call_with_retries(
+        attempt,
+        "gmail",
+        is_transient_error,
+        max_retries=settings.gmail_max_retries,
+        base_delay=settings.gmail_retry_base_delay,
+        timeout=settings.gmail_timeout_seconds,
+        budget=_gmail_budget,
+        breaker=_gmail_breaker,
+    )
+    return results
+
+
+async def fetch_attachment_bodies(service, messages: list[dict]) -> dict[str, str]:
+    """
+    Fetch message bodies that Gmail stores as attachments.
+
+    Large or unusually encoded bodies come back from ``messages.get`` with
+    an ``attachmentId`` instead of inline data. The bodies chosen by
+    ``find_body_part`` that need one are fetched together in batch calls
+    rather than one call each. Bodies that fail to fetch, including whole
+    batches that fail, are left out, and the parser falls back to the best
+    inline part.
+
+    Args:
+        service: Gmail API service
+        messages: Raw messages from Gmail API (format=full)
+
+    Returns:
+        Base64 body data keyed by attachment ID
+    """
+    pending = []
+    for message in messages:
+        part = find_body_part(message.get("payload", {}))
+        if part is not None and not part.get("body", {}).get("data"):
+            pending.append((message["id"], part["body"]["attachmentId"]))
+
+    attachment_data = {}
+    for batch_start in range(0, len(pending), BATCH_SIZE):
+        batch = pending[batch_start:batch_start + BATCH_SIZE]
+        requests = [
+            service.users()
+            .messages()
+            .attachments()
+            .get(userId="me", messageId=message_id, id=attachment_id)
+            for message_id, attachment_id in batch
+        ]
+        try:
+            results = await execute_batch(service, requests)
+        except Exception:
+            logger.exception("Fetching %d attachment bodies failed", len(batch))
+            metrics.increment("gmail_attachment_body_failures", len(batch))
+            continue
+        for (message_id, attachment_id), result in zip(batch, results):
+            if isinstance(result, dict) and result.get("data"):
+                attachment_data[attachment_id] = result["data"]
+            else:
+                metrics.increment("gmail_attachment_body_failures")
+
+    if pending:
+        metrics.increment("gmail_attachment_bodies", len(pending))
+    return attachment_data
+
+
+def build_sender_query(sender_email: str, after: datetime | None = None) -> str:
+    """Build a Gmail search query for emails from a sender."""
+    query = f"from:{sender_email}"
+    if after is not None:
+        if after.tzinfo is None:
+            after = after.replace(tzinfo=timezone.utc)
+        query += f" after:{int(after.timestamp())}"
+    return query
+
+
 async def fetch_emails_from_sender(
     user: User,
     sender_email: str,
     max_results: int = 10,
+    after: datetime | None = None,
 ) -> list[dict]:
     """
     Fetch emails from a specific sender.
@@ -30,6 +220,7 @@ async def fetch_emails_from_sender(
         user: User with OAuth credentials
         sender_email: Email address of the sender to filter by
         max_results: Maximum number of emails to fetch
+        after: Only fetch emails received after this time (naive values are UTC)
 
     Returns:
         List of email dictionaries with subject, date, and body
@@ -37,12 +228,11 @@ async def fetch_emails_from_sender(
     service = await get_gmail_service(user)
 
     # Search for emails from the sender
-    query = f"from:{sender_email}"
-    results = (
+    query = build_sender_query(sender_email, after)
+    results = await execute_request(
         service.users()
         .messages()
         .list(userId="me", q=query, maxResults=max_results)
-        .execute()
     )
 
     messages = results.get("messages", [])
@@ -50,17 +240,70 @@ async def fetch_emails_from_sender(
     if not messages:
         return []
 
-    emails = []
+    full_messages = []
     for message in messages:
         # Get full message details
-        msg = (
+        request = (
             service.users()
             .messages()
             .get(userId="me", id=message["id"], format="full")
-            .execute()
         )
+        msg = await _message_flight.do(
+            (user.id, message["id"]),
+            lambda: execute_request(request, hedge=True),
+        )
+        full_messages.append(msg)
+
+    attachment_data = await fetch_attachment_bodies(service, full_messages)
+    return [extract_email_content(msg, attachment_data) for msg in full_messages]
+
+
+async def fetch_threads_from_sender(
+    user: User,
+    sender_email: str,
+    max_results: int = 10,
+    after: datetime | None = None,
+) -> list[dict]:
+    """
+    Fetch conversations with a specific sender, one document per thread.
+
+    Each thread is fetched in a single call and its quoted content is
+    de-duplicated (see ``extract_thread_content``), so a long reply chain
+    costs one API call and is summarized once.
+
+    Args:
+        user: User with OAuth credentials
+        sender_email: Email address of the sender to filter by
+        max_results: Maximum number of threads to fetch
+        after: Only fetch threads with emails received after this time
 
-        email_data = extract_email_content(msg)
-        emails.append(email_data)
+    Returns:
+        List of thread dictionaries shaped like email dictionaries
+    """
+    service = await get_gmail_service(user)
 
-    return emails
+    query = build_sender_query(sender_email, after)
+    results = await execute_request(
+        service.users()
+        .threads()
+        .list(userId="me", q=query, maxResults=max_results)
+    )
+
+    full_threads = []
+    for thread in results.get("threads", []):
+        request = (
+            service.users()
+            .threads()
+            .get(userId="me", id=thread["id"], format="full")
+        )
+        full_thread = await _thread_flight.do(
+            (user.id, thread["id"]),
+            lambda: execute_request(request, hedge=True),
+        )
+        full_threads.append(full_thread)
+
+    attachment_data = await fetch_attachment_bodies(
+        service,
+        [message for thread in full_threads for message in thread.get("messages", [])],
+    )
+    return [extract_thread_content(thread, attachment_data) for thread in full_threads]
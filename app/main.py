@@ -1,27 +1,68 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, Depends, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, EmailStr
 
 from app.config import get_settings
-from app.db.database import init_db, get_db
+from app.db.database import init_db, get_db, async_session_maker
 from app.auth.router import router as auth_router, get_session_user_id
 from app.auth.oauth import get_user_by_id
-from app.gmail.service import fetch_emails_from_sender
+from app.auth.dependencies import get_current_user
+from app.gmail.service import fetch_emails_from_sender, fetch_threads_from_sender
 from app.summarizer.service import summarize_emails, SummarizationError
+from app.search.index import index_emails, index_summaries, init_search_index
+from app.search.router import router as search_router
+from app.state.backend import get_state_backend
+from app.summaries.router import router as summaries_router
+from app.summaries.service import store_summaries
+from app.watch.router import router as watch_router
+from app.watch.service import (
+    get_precomputed_summaries,
+    get_watched_sender,
+    run_watch_scheduler,
+)
+from app.metrics import metrics
+from app.resilience import CircuitOpenError, DeadlineExceededError
+from app.singleflight import SharedSingleFlight
+from app.warmup import warm_imports
 
 
 settings = get_settings()
 
+# orjson serializes large summary lists much faster when it is installed
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    DefaultResponse = JSONResponse
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Initialize database on startup."""
+    """
+    Initialize database on startup, warm heavy imports and start the
+    watched sender scheduler in the background. Shared state connections
+    are closed on shutdown.
+    """
     await init_db()
+    await init_search_index()
+    warmup_task = None
+    if settings.warm_imports_on_startup:
+        warmup_task = asyncio.create_task(asyncio.to_thread(warm_imports))
+    watch_task = None
+    if settings.watch_scheduler_enabled:
+        watch_task = asyncio.create_task(run_watch_scheduler())
     yield
+    if watch_task is not None:
+        watch_task.cancel()
+    if warmup_task is not None:
+        await warmup_task
+    await get_state_backend().close()
 
 
 app = FastAPI(
@@ -29,16 +70,23 @@ app = FastAPI(
     description="Summarize emails from any sender using AI",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=DefaultResponse,
 )
 
+# Compress large JSON payloads for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 # Set up templates
 templates = Jinja2Templates(directory="app/templates")
 
-# Include auth router
+# Include routers
 app.include_router(auth_router)
+app.include_router(watch_router)
+app.include_router(summaries_router)
+app.include_router(search_router)
 
 
 # Request/Response models
@@ -46,42 +94,34 @@ class SummarizeRequest(BaseModel):
     sender_email: EmailStr
     num_lines: int = 2
     max_emails: int = 10
+    thread_mode: bool = False
 
 
 class EmailSummary(BaseModel):
+    id: str | None = None
     subject: str
     date: str
     snippet: str
     summary: str
+    tokens_saved: int = 0
+    message_count: int = 1
+    degraded: bool = False
 
 
 class SummarizeResponse(BaseModel):
     summaries: list[EmailSummary]
     email_count: int
     sender_email: str
+    precomputed: bool = False
 
 
-# Dependency to get current user
-async def get_current_user(
-    request: Request,
-    db: AsyncSession = Depends(get_db),
-):
-    """Get current authenticated user or None."""
-    user_id = get_session_user_id(request)
-    if not user_id:
-        return None
-    return await get_user_by_id(db, user_id)
-
-
-async def require_auth(
-    request: Request,
-    db: AsyncSession = Depends(get_db),
-):
-    """Require authenticated user or redirect to login."""
-    user = await get_current_user(request, db)
-    if not user:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    return user
+# Concurrent identical summarize requests share one run, across workers
+summarize_flight = SharedSingleFlight(
+    "summarize",
+    dumps=lambda response: response.model_dump_json().encode(),
+    loads=SummarizeResponse.model_validate_json,
+    lock_ttl=settings.singleflight_lock_seconds,
+)
 
 
 # Routes
@@ -120,6 +160,59 @@ async def dashboard(
     )
 
 
+async def summarize_for_user(user, data: SummarizeRequest) -> SummarizeResponse:
+    """
+    Fetch, summarize, store and index emails for a summarize request.
+
+    Uses its own database session, since the run may outlive the request
+    that started it when other requests share it.
+    """
+    # Fetch emails, or whole conversations in thread mode
+    fetch = fetch_threads_from_sender if data.thread_mode else fetch_emails_from_sender
+    emails = await fetch(
+        user=user,
+        sender_email=data.sender_email,
+        max_results=data.max_emails,
+    )
+
+    if not emails:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No emails found from {data.sender_email}",
+        )
+
+    async with async_session_maker() as db:
+        await index_emails(db, user.id, emails)
+        await db.commit()
+
+        # Summarize each email individually
+        summaries = await summarize_emails(
+            emails=emails,
+            num_lines=data.num_lines,
+            sender_email=data.sender_email,
+            user_id=user.id,
+        )
+
+        # Keep results for paging through later (and so the next request
+        # for a watched sender is instant)
+        await store_summaries(
+            db,
+            user_id=user.id,
+            sender_email=data.sender_email,
+            num_lines=data.num_lines,
+            emails=emails,
+            summaries=summaries,
+        )
+        await index_summaries(db, user.id, summaries)
+        await db.commit()
+
+    return SummarizeResponse(
+        summaries=summaries,
+        email_count=len(summaries),
+        sender_email=data.sender_email,
+    )
+
+
 @app.post("/api/summarize", response_model=SummarizeResponse)
 async def api_summarize(
     request: Request,
@@ -149,33 +242,45 @@ async def api_summarize(
             detail="Max emails must be between 1 and 100",
         )
 
-    try:
-        # Fetch emails
-        emails = await fetch_emails_from_sender(
-            user=user,
+    # Watched senders are served from summaries computed ahead of time,
+    # unless fewer than requested have been stored so far; the normal path
+    # then fetches them all, reusing cached summaries of the stored ones
+    watched = None
+    if not data.thread_mode:
+        watched = await get_watched_sender(db, user.id, data.sender_email)
+    if watched:
+        summaries = await get_precomputed_summaries(
+            db,
+            user_id=user.id,
             sender_email=data.sender_email,
-            max_results=data.max_emails,
-        )
-
-        if not emails:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No emails found from {data.sender_email}",
-            )
-
-        # Summarize each email individually
-        summaries = await summarize_emails(
-            emails=emails,
             num_lines=data.num_lines,
-            sender_email=data.sender_email,
-        )
-
-        return SummarizeResponse(
-            summaries=summaries,
-            email_count=len(summaries),
-            sender_email=data.sender_email,
+            limit=data.max_emails,
         )
+        if len(summaries) >= data.max_emails:
+            return SummarizeResponse(
+                summaries=summaries,
+                email_count=len(summaries),
+                sender_email=data.sender_email,
+                precomputed=True,
+            )
 
+    # Identical concurrent requests (double clicks, several tabs) share
+    # one fetch-and-summarize run
+    key = (
+        user.id,
+        data.sender_email.strip().lower(),
+        data.num_lines,
+        data.max_emails,
+        data.thread_mode,
+    )
+    try:
+        return await summarize_flight.do(key, lambda: summarize_for_user(user, data))
+    except HTTPException:
+        raise
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=f"Temporarily unavailable: {str(e)}")
+    except DeadlineExceededError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except SummarizationError as e:
         raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
@@ -190,3 +295,9 @@ async def api_summarize(
 async def health():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """In-process metrics (model queue wait times, etc.)."""
+    return metrics.snapshot()
@@ -0,0 +1,75 @@
+import threading
+from collections import defaultdict
+
+
+def _metric_key(name: str, labels: dict) -> str:
+    """Build a flat metric key such as ``name{label=value}``."""
+    if not labels:
+        return name
+    label_text = ",".join(f"{key}={value}" for key, value in sorted(labels.items()))
+    return f"{name}{{{label_text}}}"
+
+
+class Metrics:
+    """Thread-safe in-process registry of counters, gauges and observed values."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = defaultdict(float)
+        self._gauges: dict[str, float] = {}
+        self._observations: dict[str, dict] = {}
+
+    def increment(self, name: str, amount: float = 1, **labels) -> None:
+        """Increase a counter."""
+        key = _metric_key(name, labels)
+        with self._lock:
+            self._counters[key] += amount
+
+    def set_gauge(self, name: str, value: float, **labels) -> None:
+        """Set a value that can go up and down (e.g. a circuit state)."""
+        key = _metric_key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Record a single observation (e.g. a latency or token count)."""
+        key = _metric_key(name, labels)
+        with self._lock:
+            stats = self._observations.get(key)
+            if stats is None:
+                self._observations[key] = {
+                    "count": 1,
+                    "sum": value,
+                    "min": value,
+                    "max": value,
+                }
+            else:
+                stats["count"] += 1
+                stats["sum"] += value
+                stats["min"] = min(stats["min"], value)
+                stats["max"] = max(stats["max"], value)
+
+    def snapshot(self) -> dict:
+        """Return a copy of all counters, gauges and observation summaries."""
+        with self._lock:
+            observations = {}
+            for key, stats in self._observations.items():
+                observations[key] = {
+                    **stats,
+                    "avg": stats["sum"] / stats["count"],
+                }
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "observations": observations,
+            }
+
+    def reset(self) -> None:
+        """Clear all recorded metrics."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._observations.clear()
+
+
+metrics = Metrics()
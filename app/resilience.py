@@ -0,0 +1,252 @@
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, TypeVar
+
+from app.metrics import metrics
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Gauge values of circuit states at /metrics
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a call does not finish within its deadline."""
+    pass
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit is open."""
+    pass
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float = 30.0) -> float:
+    """
+    Delay before retry number ``attempt`` (from 0): exponential with jitter.
+
+    The delay doubles with each attempt up to ``max_delay`` and is scaled by
+    a random factor between 0.5 and 1, so clients that failed together do
+    not retry together.
+    """
+    delay = min(max_delay, base_delay * 2 ** attempt)
+    return delay * random.uniform(0.5, 1.0)
+
+
+async def with_deadline(awaitable: Awaitable[T], timeout: float | None, name: str) -> T:
+    """
+    Await with a deadline, counting timeouts as ``timeouts{call=name}``.
+
+    Raises:
+        DeadlineExceededError: If the deadline passes first
+    """
+    if timeout is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, timeout)
+    except asyncio.TimeoutError:
+        metrics.increment("timeouts", call=name)
+        raise DeadlineExceededError(f"{name} call exceeded {timeout}s deadline")
+
+
+class RetryBudget:
+    """
+    Limit retries to a fraction of calls so retries cannot multiply load
+    on a struggling dependency.
+
+    Every call deposits ``ratio`` tokens and every retry spends one, up to a
+    reserve of ``min_retries`` tokens that allows retries after idle periods.
+    """
+
+    def __init__(self, name: str, ratio: float = 0.2, min_retries: int = 10):
+        self.name = name
+        self.ratio = ratio
+        self.capacity = max(1, min_retries)
+        self._tokens = float(self.capacity)
+
+    def record_call(self) -> None:
+        """Record a call, earning part of a retry."""
+        self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Spend a retry if the budget allows it."""
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        metrics.increment("retry_budget_exhausted", call=self.name)
+        return False
+
+
+class CircuitBreaker:
+    """
+    Stop calling a dependency after repeated failures.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail fast with ``CircuitOpenError``. After ``reset_timeout``
+    seconds one trial call is let through (half open): its success closes
+    the circuit, its failure opens it again. The state is exported as the
+    ``circuit_state{circuit=name}`` gauge (0 closed, 1 half open, 2 open).
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._state = CLOSED
+        metrics.set_gauge("circuit_state", _STATE_VALUES[CLOSED], circuit=name)
+
+    @property
+    def state(self) -> str:
+        """Current state: closed, open or half_open."""
+        return self._state
+
+    def _set_state(self, state: str) -> None:
+        if state != self._state:
+            self._state = state
+            metrics.set_gauge("circuit_state", _STATE_VALUES[state], circuit=self.name)
+            metrics.increment("circuit_transitions", circuit=self.name, state=state)
+
+    def before_call(self) -> None:
+        """
+        Check that a call may go ahead.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half open with the
+                trial call still running
+        """
+        if self._state == OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                metrics.increment("circuit_rejections", circuit=self.name)
+                raise CircuitOpenError(f"{self.name} circuit is open")
+            self._set_state(HALF_OPEN)
+
+        if self._state == HALF_OPEN:
+            if self._trial_running:
+                metrics.increment("circuit_rejections", circuit=self.name)
+                raise CircuitOpenError(f"{self.name} circuit is half open")
+            self._trial_running = True
+
+    def record_success(self) -> None:
+        """Record a successful call."""
+        self._failures = 0
+        self._trial_running = False
+        self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit when needed."""
+        self._failures += 1
+        self._trial_running = False
+        if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            self._set_state(OPEN)
+
+    def record_ignored(self) -> None:
+        """Record a call whose outcome says nothing about the dependency."""
+        self._trial_running = False
+
+
+async def call_with_retries(
+    fn: Callable[[], Awaitable[T]],
+    name: str,
+    is_transient: Callable[[Exception], bool],
+    max_retries: int,
+    base_delay: float,
+    timeout: float | None = None,
+    budget: RetryBudget | None = None,
+    breaker: CircuitBreaker | None = None,
+) -> T:
+    """
+    Call ``fn`` with a per-attempt deadline, retrying transient failures.
+
+    Deadline overruns and errors for which ``is_transient`` is true are
+    retried with ``backoff_delay`` up to ``max_retries`` times, while the
+    retry budget allows it, and count as failures for the circuit breaker.
+    Other errors are raised at once. Retries are counted as
+    ``retries{call=name}``.
+
+    Args:
+        fn: Function returning a new awaitable for each attempt
+        name: Name of the call in metrics
+        is_transient: Whether an error is worth retrying
+        max_retries: Maximum number of retries
+        base_delay: Delay before the first retry, in seconds
+        timeout: Deadline of each attempt, in seconds
+        budget: Retry budget shared by calls to the same dependency
+        breaker: Circuit breaker of the dependency
+
+    Raises:
+        CircuitOpenError: If the circuit breaker rejects the call
+    """
+    for attempt in range(max_retries + 1):
+        if breaker is not None:
+            breaker.before_call()
+        if budget is not None:
+            budget.record_call()
+
+        try:
+            result = await with_deadline(fn(), timeout, name)
+        except asyncio.CancelledError:
+            if breaker is not None:
+                breaker.record_ignored()
+            raise
+        except Exception as e:
+            transient = isinstance(e, TimeoutError) or is_transient(e)
+            if breaker is not None:
+                if transient:
+                    breaker.record_failure()
+                else:
+                    breaker.record_ignored()
+            if not transient or attempt >= max_retries:
+                raise
+            if budget is not None and not budget.try_spend():
+                raise
+            metrics.increment("retries", call=name)
+            await asyncio.sleep(backoff_delay(attempt, base_delay))
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return result
+
+
+async def hedged(fn: Callable[[], Awaitable[T]], delay: float, name: str) -> T:
+    """
+    Cut tail latency by sending a second identical call if the first is slow.
+
+    If ``fn`` has not finished after ``delay`` seconds, a hedge call is
+    started and the first successful result wins; the other call is
+    cancelled. Only use this for idempotent calls. Hedges are counted as
+    ``hedged_requests{call=name}`` and hedges that won as ``hedge_wins``.
+    """
+    primary = asyncio.ensure_future(fn())
+    try:
+        return await asyncio.wait_for(asyncio.shield(primary), delay)
+    except asyncio.TimeoutError:
+        pass
+    except BaseException:
+        primary.cancel()
+        raise
+
+    metrics.increment("hedged_requests", call=name)
+    hedge = asyncio.ensure_future(fn())
+    pending = {primary, hedge}
+    error = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge:
+                        metrics.increment("hedge_wins", call=name)
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,204 @@
+import logging
+import re
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import engine, insert_ignoring_conflicts
+from app.db.models import IndexedEmail
+
+logger = logging.getLogger(__name__)
+
+# Longest body stored in the index; the rest is rarely useful for lookups.
+MAX_INDEXED_BODY_LENGTH = 20000
+
+_CREATE_INDEX = """
+CREATE VIRTUAL TABLE IF NOT EXISTS email_search USING fts5(
+    subject,
+    sender,
+    body,
+    summary,
+    date UNINDEXED,
+    tokenize = 'porter unicode61'
+)
+"""
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+# Set by init_search_index; search is unavailable without SQLite FTS5.
+_search_available = False
+
+
+class SearchUnavailableError(Exception):
+    """Raised when the database does not support full-text search."""
+    pass
+
+
+def search_available() -> bool:
+    """Whether the full-text index is available."""
+    return _search_available
+
+
+async def init_search_index() -> None:
+    """Create the full-text index if the database supports SQLite FTS5."""
+    global _search_available
+
+    if engine.dialect.name != "sqlite":
+        logger.info("Full-text search disabled: requires SQLite")
+        return
+
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text(_CREATE_INDEX))
+    except Exception:
+        logger.exception("Full-text search disabled: SQLite FTS5 is unavailable")
+        return
+
+    _search_available = True
+
+
+def build_match_query(query: str) -> str:
+    """
+    Turn free text into an FTS5 query matching all of its terms.
+
+    Terms are quoted so FTS5 operators in user input are not interpreted;
+    the last term matches as a prefix to support search-as-you-type.
+    """
+    terms = _TERM.findall(query)
+    if not terms:
+        return ""
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+async def get_indexed_message_ids(
+    db: AsyncSession,
+    user_id: int,
+    message_ids: list[str],
+) -> set[str]:
+    """Get which of the given messages are already in a user's index."""
+    stmt = select(IndexedEmail.message_id).where(
+        IndexedEmail.user_id == user_id,
+        IndexedEmail.message_id.in_(message_ids),
+    )
+    return set((await db.execute(stmt)).scalars())
+
+
+async def index_emails(db: AsyncSession, user_id: int, emails: list[dict]) -> int:
+    """
+    Add newly fetched emails to a user's search index (the caller commits).
+
+    Emails that are already indexed are skipped, so this can be called with
+    every fetch.
+
+    Returns:
+        Number of emails added
+    """
+    if not _search_available or not emails:
+        return 0
+
+    indexed = await get_indexed_message_ids(db, user_id, [email["id"] for email in emails])
+
+    added = 0
+    for email in emails:
+        if email["id"] in indexed:
+            continue
+        indexed.add(email["id"])
+
+        # Another run may index the same email concurrently; its row wins
+        rowid = await db.scalar(
+            insert_ignoring_conflicts(IndexedEmail)
+            .values(user_id=user_id, message_id=email["id"])
+            .returning(IndexedEmail.id)
+        )
+        if rowid is None:
+            continue
+
+        await db.execute(
+            text(
+                "INSERT INTO email_search (rowid, subject, sender, body, summary, date) "
+                "VALUES (:rowid, :subject, :sender, :body, '', :date)"
+            ),
+            {
+                "rowid": rowid,
+                "subject": email.get("subject", ""),
+                "sender": email.get("sender", ""),
+                "body": (email.get("body") or email.get("snippet", ""))[:MAX_INDEXED_BODY_LENGTH],
+                "date": email.get("date", ""),
+            },
+        )
+        added += 1
+
+    return added
+
+
+async def index_summaries(db: AsyncSession, user_id: int, summaries: list[dict]) -> None:
+    """Attach generated summaries to already indexed emails (the caller commits)."""
+    if not _search_available or not summaries:
+        return
+
+    ids = [summary["id"] for summary in summaries if summary.get("id")]
+    stmt = select(IndexedEmail.message_id, IndexedEmail.id).where(
+        IndexedEmail.user_id == user_id,
+        IndexedEmail.message_id.in_(ids),
+    )
+    rowids = dict((await db.execute(stmt)).all())
+
+    for summary in summaries:
+        rowid = rowids.get(summary.get("id"))
+        if rowid is None or summary.get("degraded"):
+            continue
+        await db.execute(
+            text("UPDATE email_search SET summary = :summary WHERE rowid = :rowid"),
+            {"summary": summary["summary"], "rowid": rowid},
+        )
+
+
+async def search_emails(
+    db: AsyncSession,
+    user_id: int,
+    query: str,
+    limit: int = 20,
+) -> list[dict]:
+    """
+    Search a user's indexed emails and summaries.
+
+    Results are ranked by BM25, with subject and summary matches weighted
+    above body matches, and carry a highlighted snippet of the best match.
+
+    Raises:
+        SearchUnavailableError: If the database does not support search
+    """
+    if not _search_available:
+        raise SearchUnavailableError("Full-text search requires SQLite with FTS5")
+
+    match = build_match_query(query)
+    if not match:
+        return []
+
+    result = await db.execute(
+        text(
+            "SELECT e.message_id, s.subject, s.sender, s.date, s.summary, "
+            "snippet(email_search, -1, '[', ']', '...', 16) AS snippet, "
+            "bm25(email_search, 4.0, 2.0, 1.0, 3.0) AS score "
+            "FROM email_search AS s "
+            "JOIN indexed_emails AS e ON e.id = s.rowid "
+            "WHERE email_search MATCH :match AND e.user_id = :user_id "
+            "ORDER BY score "
+            "LIMIT :limit"
+        ),
+        {"match": match, "user_id": user_id, "limit": limit},
+    )
+    return [
+        {
+            "id": row.message_id,
+            "subject": row.subject,
+            "sender": row.sender,
+            "date": row.date,
+            "summary": row.summary,
+            "snippet": row.snippet,
+            "score": -row.score,
+        }
+        for row in result
+    ]
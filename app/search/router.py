@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import get_db
+from app.auth.dependencies import require_auth
+from app.search.index import SearchUnavailableError, search_emails
+
+router = APIRouter(prefix="/api/search", tags=["search"])
+
+
+@router.get("")
+async def search(
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=20, ge=1, le=100),
+    user=Depends(require_auth),
+    db: AsyncSession = Depends(get_db),
+):
+    """Search fetched emails and their summaries, best matches first."""
+    try:
+        results = await search_emails(db, user_id=user.id, query=q, limit=limit)
+    except SearchUnavailableError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    return {"results": results}
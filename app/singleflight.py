@@ -0,0 +1,133 @@
+import asyncio
+import hashlib
+import uuid
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+from app.metrics import metrics
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key into one execution.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs wait for the same task and share its result or exception.
+    The work is shielded from cancellation, so one caller going away (e.g. a
+    closed browser tab) does not fail the others. Results are shared, not
+    copied, so callers must not mutate them.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Whether work for a key is currently running."""
+        return key in self._tasks
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` for a key, or join the run already in flight."""
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            metrics.increment("singleflight_calls", group=self.name)
+        else:
+            metrics.increment("singleflight_shared", group=self.name)
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Mark the exception as retrieved in case every caller went away
+        if not task.cancelled():
+            task.exception()
+
+
+class SharedSingleFlight(SingleFlight):
+    """
+    Single-flight across every worker sharing the state backend.
+
+    Calls are first coalesced in this process, then across processes: the
+    process holding the key's lock runs the work and publishes the result,
+    tagged with its run ID, for the others, which poll for the result of
+    the run they waited on. If the lock holder fails or dies without a
+    result, a waiting process takes over the lock and runs the work itself.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        dumps: Callable[[T], bytes],
+        loads: Callable[[bytes], T],
+        lock_ttl: float,
+        result_ttl: float = 30.0,
+        poll_interval: float = 0.5,
+    ):
+        super().__init__(name)
+        self.dumps = dumps
+        self.loads = loads
+        self.lock_ttl = lock_ttl
+        self.result_ttl = result_ttl
+        self.poll_interval = poll_interval
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` for a key, or join the run in flight in any worker."""
+        return await super().do(key, lambda: self._run_shared(key, fn))
+
+    async def _run_shared(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        from app.state.backend import get_state_backend
+
+        backend = get_state_backend()
+        digest = hashlib.sha256(repr(key).encode()).hexdigest()
+        lock_key = f"singleflight:{self.name}:{digest}:lock"
+        result_key = f"singleflight:{self.name}:{digest}:result"
+        # Identifies this run; the lock holds it and the result is tagged with it
+        token = uuid.uuid4().hex.encode()
+
+        awaited_run = None
+        while True:
+            if awaited_run is not None:
+                result = await self._published_result(backend, result_key, awaited_run)
+                if result is not None:
+                    return self.loads(result)
+
+            if await backend.acquire_lock(lock_key, token, self.lock_ttl):
+                # The awaited run may have finished just before the lock was free
+                if awaited_run is not None:
+                    result = await self._published_result(backend, result_key, awaited_run)
+                    if result is not None:
+                        await backend.release_lock(lock_key, token)
+                        return self.loads(result)
+                break
+
+            holder = await backend.get(lock_key)
+            if holder is not None:
+                awaited_run = holder
+            await asyncio.sleep(self.poll_interval)
+
+        try:
+            result = await fn()
+            await backend.set(
+                result_key,
+                token + b":" + self.dumps(result),
+                ttl=self.result_ttl,
+            )
+            return result
+        finally:
+            await backend.release_lock(lock_key, token)
+
+    async def _published_result(self, backend, result_key: str, run: bytes) -> bytes | None:
+        """The published result of a run, if it has finished."""
+        data = await backend.get(result_key)
+        if data is None:
+            return None
+        tag, _, result = data.partition(b":")
+        if tag != run:
+            return None
+        metrics.increment("singleflight_shared_remote", group=self.name)
+        return result
@@ -0,0 +1,56 @@
+import asyncio
+from functools import lru_cache
+
+from app.config import get_settings
+from app.metrics import metrics
+from app.state.base import StateBackend
+
+settings = get_settings()
+
+
+@lru_cache
+def get_state_backend() -> StateBackend:
+    """
+    Get the configured shared state backend.
+
+    ``memory`` keeps state in this process; ``redis`` shares it between
+    every worker and node pointing at ``redis_url``.
+    """
+    if settings.state_backend == "redis":
+        from app.state.redis_backend import RedisBackend
+
+        return RedisBackend(settings.redis_url)
+    if settings.state_backend == "memory":
+        from app.state.memory import InMemoryBackend
+
+        return InMemoryBackend()
+    raise ValueError(f"Unknown state backend: {settings.state_backend}")
+
+
+async def wait_for_tokens(
+    bucket: str,
+    capacity: float,
+    refill_per_second: float,
+    amount: float = 1,
+) -> float:
+    """
+    Wait until a shared token bucket can pay for ``amount`` tokens.
+
+    Amounts above the bucket capacity are capped so they cannot wait forever.
+
+    Returns:
+        Seconds spent waiting
+    """
+    backend = get_state_backend()
+    amount = min(amount, capacity)
+    waited = 0.0
+    while True:
+        wait = await backend.take_tokens(bucket, capacity, refill_per_second, amount)
+        if wait <= 0:
+            break
+        await asyncio.sleep(wait)
+        waited += wait
+
+    if waited:
+        metrics.observe("rate_limit_wait_seconds", waited, bucket=bucket)
+    return waited
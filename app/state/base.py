@@ -0,0 +1,73 @@
+from abc import ABC, abstractmethod
+
+
+class StateBackend(ABC):
+    """
+    Shared state used to coordinate work across workers and nodes.
+
+    Holds cache entries, locks, token buckets and job queues. Values are
+    bytes; callers handle serialization.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """Get a value, or None if it is missing or expired."""
+
+    @abstractmethod
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        ttl: float | None = None,
+        only_if_absent: bool = False,
+    ) -> bool:
+        """
+        Set a value, optionally expiring after ttl seconds.
+
+        Returns:
+            False if only_if_absent was set and the key already exists
+        """
+
+    @abstractmethod
+    async def delete(self, key: str, only_if_value: bytes | None = None) -> bool:
+        """
+        Delete a key, optionally only if it still holds the given value.
+
+        Returns:
+            Whether the key was deleted
+        """
+
+    @abstractmethod
+    async def take_tokens(
+        self,
+        key: str,
+        capacity: float,
+        refill_per_second: float,
+        amount: float = 1,
+    ) -> float:
+        """
+        Take tokens from a token bucket, creating it full if missing.
+
+        Returns:
+            0 if the tokens were taken, otherwise the seconds to wait before
+            enough tokens are available (nothing is taken in that case)
+        """
+
+    @abstractmethod
+    async def enqueue(self, queue: str, value: bytes) -> None:
+        """Append a job to a queue."""
+
+    @abstractmethod
+    async def dequeue(self, queue: str, timeout: float) -> bytes | None:
+        """Pop the oldest job from a queue, waiting up to timeout seconds."""
+
+    async def close(self) -> None:
+        """Release connections held by the backend."""
+
+    async def acquire_lock(self, key: str, token: bytes, ttl: float) -> bool:
+        """Acquire a lock that expires after ttl seconds unless released."""
+        return await self.set(key, token, ttl=ttl, only_if_absent=True)
+
+    async def release_lock(self, key: str, token: bytes) -> bool:
+        """Release a lock if it is still held with the given token."""
+        return await self.delete(key, only_if_value=token)
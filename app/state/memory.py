@@ -0,0 +1,95 @@
+import asyncio
+import time
+from collections import deque
+
+from app.state.base import StateBackend
+
+
+class InMemoryBackend(StateBackend):
+    """State backend for a single process; nothing is shared between workers."""
+
+    def __init__(self):
+        self._values: dict[str, tuple[bytes, float | None]] = {}
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._queues: dict[str, deque] = {}
+        self._queue_events: dict[str, asyncio.Event] = {}
+
+    def _live_value(self, key: str) -> bytes | None:
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._values[key]
+            return None
+        return value
+
+    async def get(self, key: str) -> bytes | None:
+        return self._live_value(key)
+
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        ttl: float | None = None,
+        only_if_absent: bool = False,
+    ) -> bool:
+        if only_if_absent and self._live_value(key) is not None:
+            return False
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._values[key] = (value, expires_at)
+        return True
+
+    async def delete(self, key: str, only_if_value: bytes | None = None) -> bool:
+        value = self._live_value(key)
+        if value is None:
+            return False
+        if only_if_value is not None and value != only_if_value:
+            return False
+        del self._values[key]
+        return True
+
+    async def take_tokens(
+        self,
+        key: str,
+        capacity: float,
+        refill_per_second: float,
+        amount: float = 1,
+    ) -> float:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+
+        if tokens >= amount:
+            self._buckets[key] = (tokens - amount, now)
+            return 0.0
+
+        self._buckets[key] = (tokens, now)
+        return (amount - tokens) / refill_per_second
+
+    def _queue_event(self, queue: str) -> asyncio.Event:
+        event = self._queue_events.get(queue)
+        if event is None:
+            event = self._queue_events[queue] = asyncio.Event()
+        return event
+
+    async def enqueue(self, queue: str, value: bytes) -> None:
+        self._queues.setdefault(queue, deque()).append(value)
+        self._queue_event(queue).set()
+
+    async def dequeue(self, queue: str, timeout: float) -> bytes | None:
+        deadline = time.monotonic() + timeout
+        while True:
+            jobs = self._queues.get(queue)
+            if jobs:
+                return jobs.popleft()
+
+            event = self._queue_event(queue)
+            event.clear()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(event.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
@@ -0,0 +1,102 @@
+import time
+
+from app.state.base import StateBackend
+
+# Refill and take from a bucket atomically. Buckets are hashes of
+# (tokens, updated_at) and expire once they would be full again.
+_TAKE_TOKENS = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local amount = tonumber(ARGV[3])
+local now = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+local wait = 0
+if tokens >= amount then
+    tokens = tokens - amount
+else
+    wait = (amount - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+_DELETE_IF_EQUALS = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisBackend(StateBackend):
+    """
+    State backend shared by every worker connected to the same Redis server.
+
+    Works with Redis and compatible servers (Valkey, KeyDB, ...). Requires
+    the optional ``redis`` package.
+    """
+
+    def __init__(self, url: str, prefix: str = "email-summarizer:", client=None):
+        if client is None:
+            # Imported lazily: redis is only needed when this backend is configured
+            import redis.asyncio as redis
+
+            client = redis.from_url(url)
+        self._client = client
+        self._prefix = prefix
+        self._take_tokens = self._client.register_script(_TAKE_TOKENS)
+        self._delete_if_equals = self._client.register_script(_DELETE_IF_EQUALS)
+
+    def _key(self, key: str) -> str:
+        return self._prefix + key
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._client.get(self._key(key))
+
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        ttl: float | None = None,
+        only_if_absent: bool = False,
+    ) -> bool:
+        px = max(1, int(ttl * 1000)) if ttl is not None else None
+        result = await self._client.set(self._key(key), value, px=px, nx=only_if_absent)
+        return bool(result)
+
+    async def delete(self, key: str, only_if_value: bytes | None = None) -> bool:
+        if only_if_value is None:
+            return bool(await self._client.delete(self._key(key)))
+        result = await self._delete_if_equals(keys=[self._key(key)], args=[only_if_value])
+        return bool(result)
+
+    async def take_tokens(
+        self,
+        key: str,
+        capacity: float,
+        refill_per_second: float,
+        amount: float = 1,
+    ) -> float:
+        # Wall-clock time so that every node refills buckets the same way
+        wait = await self._take_tokens(
+            keys=[self._key(key)],
+            args=[capacity, refill_per_second, amount, time.time()],
+        )
+        return float(wait)
+
+    async def enqueue(self, queue: str, value: bytes) -> None:
+        await self._client.rpush(self._key(queue), value)
+
+    async def dequeue(self, queue: str, timeout: float) -> bytes | None:
+        # BLPOP takes whole seconds on old servers; 0 would block forever
+        result = await self._client.blpop([self._key(queue)], timeout=max(1, round(timeout)))
+        if result is None:
+            return None
+        return result[1]
+
+    async def close(self) -> None:
+        await self._client.aclose()
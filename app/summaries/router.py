@@ -0,0 +1,87 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import get_db
+from app.auth.dependencies import require_auth
+from app.summaries.service import (
+    SUMMARY_FIELDS,
+    InvalidCursorError,
+    list_summaries_page,
+    summary_to_dict,
+)
+
+router = APIRouter(prefix="/api/summaries", tags=["summaries"])
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _dumps(value) -> bytes:
+    """Serialize to JSON bytes, using orjson when it is installed."""
+    try:
+        import orjson
+    except ImportError:
+        import json
+
+        return json.dumps(value, separators=(",", ":")).encode()
+    return orjson.dumps(value)
+
+
+def parse_fields(fields: str | None) -> tuple[str, ...]:
+    """Parse a comma-separated field selection."""
+    if not fields:
+        return SUMMARY_FIELDS
+    selected = tuple(field.strip() for field in fields.split(",") if field.strip())
+    unknown = [field for field in selected if field not in SUMMARY_FIELDS]
+    if unknown or not selected:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. "
+                   f"Allowed: {', '.join(SUMMARY_FIELDS)}",
+        )
+    return selected
+
+
+@router.get("")
+async def list_summaries(
+    request: Request,
+    sender_email: str | None = None,
+    num_lines: int | None = None,
+    cursor: str | None = None,
+    limit: int = Query(default=20, ge=1, le=100),
+    fields: str | None = None,
+    user=Depends(require_auth),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Page through stored summaries, newest first.
+
+    Pass ``next_cursor`` from a page as ``cursor`` to get the next one, and
+    ``fields`` (e.g. ``subject,date,summary``) to omit unused fields. With
+    ``Accept: application/x-ndjson`` the items are streamed one JSON object
+    per line and the next cursor is sent in the ``X-Next-Cursor`` header.
+    """
+    selected = parse_fields(fields)
+    try:
+        records, next_cursor = await list_summaries_page(
+            db,
+            user_id=user.id,
+            limit=limit,
+            cursor=cursor,
+            sender_email=sender_email,
+            num_lines=num_lines,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    items = [summary_to_dict(record, selected) for record in records]
+
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        return StreamingResponse(
+            (_dumps(item) + b"\n" for item in items),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers=headers,
+        )
+
+    return {"items": items, "next_cursor": next_cursor}
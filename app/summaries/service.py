@@ -0,0 +1,169 @@
+import base64
+import binascii
+from datetime import datetime
+
+from sqlalchemy import DateTime, func, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import insert_ignoring_conflicts
+from app.db.models import SummaryRecord
+
+# Fields a client may select from a stored summary.
+SUMMARY_FIELDS = (
+    "id",
+    "sender_email",
+    "num_lines",
+    "subject",
+    "date",
+    "snippet",
+    "summary",
+)
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+    pass
+
+
+# Summaries without a receive time sort as the oldest.
+_NO_RECEIVED_AT = datetime(1970, 1, 1)
+_SORT_TIME = func.coalesce(SummaryRecord.received_at, literal(_NO_RECEIVED_AT, DateTime))
+
+
+def encode_cursor(received_at: datetime | None, record_id: int) -> str:
+    """Encode the position after a record as an opaque cursor."""
+    position = f"{(received_at or _NO_RECEIVED_AT).isoformat()}|{record_id}"
+    return base64.urlsafe_b64encode(position.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by ``encode_cursor``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        received_at, record_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return datetime.fromisoformat(received_at), int(record_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError("Invalid cursor")
+
+
+async def get_stored_message_ids(
+    db: AsyncSession,
+    user_id: int,
+    num_lines: int,
+    message_ids: list[str],
+) -> set[str]:
+    """Get which of the given messages already have a stored summary."""
+    if not message_ids:
+        return set()
+    stmt = select(SummaryRecord.message_id).where(
+        SummaryRecord.user_id == user_id,
+        SummaryRecord.num_lines == num_lines,
+        SummaryRecord.message_id.in_(message_ids),
+    )
+    return set((await db.execute(stmt)).scalars())
+
+
+async def store_summaries(
+    db: AsyncSession,
+    user_id: int,
+    sender_email: str,
+    num_lines: int,
+    emails: list[dict],
+    summaries: list[dict],
+) -> int:
+    """
+    Store new summaries of fetched emails (the caller commits).
+
+    Summaries already stored for the same message and length, including
+    ones stored concurrently by another run, and degraded (locally
+    extracted) summaries, are skipped. Records are added oldest
+    first so that ID order follows receive order.
+
+    Returns:
+        Number of summaries added
+    """
+    stored = await get_stored_message_ids(
+        db, user_id, num_lines, [email["id"] for email in emails]
+    )
+    pairs = [
+        (email, summary)
+        for email, summary in zip(emails, summaries)
+        if email["id"] not in stored and not summary.get("degraded")
+    ]
+    pairs.sort(key=lambda pair: pair[0].get("timestamp", 0))
+
+    # Another run may store the same summaries concurrently; its rows win
+    added = 0
+    for email, summary in pairs:
+        result = await db.execute(
+            insert_ignoring_conflicts(SummaryRecord).values(
+                user_id=user_id,
+                sender_email=sender_email.lower(),
+                message_id=email["id"],
+                num_lines=num_lines,
+                subject=summary["subject"],
+                date=summary["date"],
+                snippet=summary["snippet"],
+                summary=summary["summary"],
+                received_at=(
+                    datetime.utcfromtimestamp(email["timestamp"])
+                    if email.get("timestamp") else None
+                ),
+            )
+        )
+        added += result.rowcount
+    return added
+
+
+def summary_to_dict(record: SummaryRecord, fields: tuple[str, ...] = SUMMARY_FIELDS) -> dict:
+    """Serialize a stored summary, keeping only the selected fields."""
+    values = {
+        "id": record.message_id,
+        "sender_email": record.sender_email,
+        "num_lines": record.num_lines,
+        "subject": record.subject,
+        "date": record.date,
+        "snippet": record.snippet,
+        "summary": record.summary,
+    }
+    return {field: values[field] for field in fields}
+
+
+async def list_summaries_page(
+    db: AsyncSession,
+    user_id: int,
+    limit: int,
+    cursor: str | None = None,
+    sender_email: str | None = None,
+    num_lines: int | None = None,
+) -> tuple[list[SummaryRecord], str | None]:
+    """
+    Get one page of a user's stored summaries, newest first.
+
+    Summaries are ordered by when their email was received, then by record
+    ID. Uses keyset pagination on both, so pages stay stable while new
+    summaries are stored.
+
+    Returns:
+        The records on the page and the cursor of the next page, if any
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    stmt = select(SummaryRecord).where(SummaryRecord.user_id == user_id)
+    if sender_email:
+        stmt = stmt.where(SummaryRecord.sender_email == sender_email.lower())
+    if num_lines:
+        stmt = stmt.where(SummaryRecord.num_lines == num_lines)
+    if cursor:
+        stmt = stmt.where(tuple_(_SORT_TIME, SummaryRecord.id) < decode_cursor(cursor))
+
+    # Fetch one extra row to know whether there is a next page
+    stmt = stmt.order_by(_SORT_TIME.desc(), SummaryRecord.id.desc()).limit(limit + 1)
+    records = list((await db.execute(stmt)).scalars())
+
+    next_cursor = None
+    if len(records) > limit:
+        records = records[:limit]
+        next_cursor = encode_cursor(records[-1].received_at, records[-1].id)
+    return records, next_cursor
@@ -0,0 +1,74 @@
+import hashlib
+import logging
+
+from app.config import get_settings
+from app.state.backend import get_state_backend
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def summary_cache_key(user_id: int | None, email: dict, num_lines: int) -> str:
+    """
+    Cache key for an email's summary.
+
+    Includes a hash of the body so edited drafts or re-compacted bodies do
+    not reuse a stale summary.
+    """
+    body = email.get("body") or email.get("snippet", "")
+    digest = hashlib.sha256(body.encode()).hexdigest()[:16]
+    return f"summary:{user_id}:{email.get('id')}:{num_lines}:{digest}"
+
+
+async def get_cached_summaries(
+    user_id: int | None,
+    emails: list[dict],
+    num_lines: int,
+) -> dict[int, str]:
+    """
+    Look up cached summaries shared by all workers.
+
+    Cache errors are logged and treated as misses.
+
+    Returns:
+        Summaries keyed by the index of their email
+    """
+    if settings.summary_cache_ttl_seconds <= 0:
+        return {}
+
+    backend = get_state_backend()
+    cached = {}
+    try:
+        for i, email in enumerate(emails):
+            if not email.get("id"):
+                continue
+            value = await backend.get(summary_cache_key(user_id, email, num_lines))
+            if value is not None:
+                cached[i] = value.decode()
+    except Exception:
+        logger.exception("Summary cache lookup failed")
+    return cached
+
+
+async def cache_summaries(
+    user_id: int | None,
+    emails: list[dict],
+    summaries: dict[int, str],
+    num_lines: int,
+) -> None:
+    """Store summaries (keyed by email index) in the shared cache."""
+    if settings.summary_cache_ttl_seconds <= 0:
+        return
+
+    backend = get_state_backend()
+    try:
+        for i, summary in summaries.items():
+            if not emails[i].get("id"):
+                continue
+            await backend.set(
+                summary_cache_key(user_id, emails[i], num_lines),
+                summary.encode(),
+                ttl=settings.summary_cache_ttl_seconds,
+            )
+    except Exception:
+        logger.exception("Summary cache update failed")
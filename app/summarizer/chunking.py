@@ -0,0 +1,99 @@
+import math
+import re
+
+# Boundaries to split on, from coarsest to finest: paragraphs/sections,
+# lines, then sentences. Text that still does not fit is cut hard.
+_SPLITTERS = (
+    re.compile(r"\n\s*\n|\n(?=[-=_*#]{3,}\s*\n)"),
+    re.compile(r"\n"),
+    re.compile(r"(?<=[.!?])\s+"),
+)
+
+
+def _split_pieces(text: str, max_chars: int, level: int = 0) -> list[str]:
+    """Break text into pieces of at most max_chars at the coarsest boundary possible."""
+    if len(text) <= max_chars:
+        return [text]
+
+    if level >= len(_SPLITTERS):
+        return [text[i:i + max_chars] for i in range(0, len(text), max_chars)]
+
+    parts = [part.strip() for part in _SPLITTERS[level].split(text)]
+    parts = [part for part in parts if part]
+    if len(parts) <= 1:
+        return _split_pieces(text, max_chars, level + 1)
+
+    pieces = []
+    for part in parts:
+        pieces.extend(_split_pieces(part, max_chars, level + 1))
+    return pieces
+
+
+def split_into_chunks(text: str, max_chars: int) -> list[str]:
+    """
+    Split text into chunks at paragraph and section boundaries.
+
+    Adjacent paragraphs are packed together until a chunk would exceed
+    max_chars; paragraphs that are too long on their own are split at line,
+    then sentence boundaries.
+
+    Args:
+        text: Text to split
+        max_chars: Maximum length of each chunk
+
+    Returns:
+        List of chunks in document order
+    """
+    text = text.strip()
+    if not text:
+        return []
+
+    chunks = []
+    current = ""
+    for piece in _split_pieces(text, max_chars):
+        if not current:
+            current = piece
+        elif len(current) + 2 + len(piece) <= max_chars:
+            current = f"{current}\n\n{piece}"
+        else:
+            chunks.append(current)
+            current = piece
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_into_at_most(
+    text: str,
+    max_chunks: int,
+    min_chars: int,
+    max_chars: int,
+) -> tuple[list[str], int]:
+    """
+    Split text into at most ``max_chunks`` chunks that cover all of it.
+
+    Chunks are sized to ``ceil(len(text) / max_chunks)``, at least
+    ``min_chars`` and at most ``max_chars``, and grown while boundary
+    packing still needs more chunks. Only text that does not fit in
+    ``max_chunks`` chunks of ``max_chars`` is dropped from the end.
+
+    Args:
+        text: Text to split
+        max_chunks: Maximum number of chunks
+        min_chars: Smallest chunk size to use
+        max_chars: Largest chunk size the model should be given
+
+    Returns:
+        The chunks in document order and the number of characters dropped
+    """
+    text = text.strip()
+    size = min(max_chars, max(min_chars, math.ceil(len(text) / max_chunks)))
+    chunks = split_into_chunks(text, size)
+    while len(chunks) > max_chunks and size < max_chars:
+        size = min(max_chars, math.ceil(size * 1.25))
+        chunks = split_into_chunks(text, size)
+
+    kept = chunks[:max_chunks]
+    dropped = sum(len(chunk) for chunk in chunks[max_chunks:])
+    return kept, dropped
@@ -0,0 +1,198 @@
+import re
+
+from app.gmail.parser import FORWARD_MARKER, find_reply_header, format_thread_body
+from app.metrics import metrics
+from app.summarizer.tokens import estimate_tokens
+
+# Everything from a reply header (see ``find_reply_header``) or one of these
+# signature markers onwards is dropped. Forwarded messages are kept: their
+# text is usually the point of the email.
+_SIGNATURE_MARKER = re.compile(
+    r"^(?:"
+    r"-- ?$"                                       # Standard signature delimiter
+    r"|Sent from my \w+"
+    r"|Get Outlook for \w+"
+    r")",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# Footer, unsubscribe and legal boilerplate signals.
+_FOOTER_SIGNAL = re.compile(
+    r"unsubscribe"
+    r"|manage (?:your )?(?:email )?(?:preferences|subscriptions?)"
+    r"|update (?:your )?(?:email )?preferences"
+    r"|view (?:this email )?in (?:your |a )?browser"
+    r"|you(?:'re| are) receiving this"
+    r"|(?:this|the) (?:e-?mail|message) was sent to"
+    r"|add us to your address book"
+    r"|all rights reserved"
+    r"|^\s*(?:©|\(c\)|copyright)\s"
+    r"|(?:this|the) (?:e-?mail|message)(?: and any attachments?)? (?:is|are|may (?:be|contain)) "
+    r"(?:confidential|privileged|intended (?:solely|only))"
+    r"|if you are not the intended recipient"
+    r"|if you (?:have )?received this (?:e-?mail|message) in error",
+    re.IGNORECASE,
+)
+
+# Signals that also appear in ordinary sentences; they only count on short,
+# link-bar shaped lines such as "Privacy Policy | Terms of Service".
+_WEAK_FOOTER_SIGNAL = re.compile(
+    r"privacy policy|terms (?:of (?:service|use)|and conditions)",
+    re.IGNORECASE,
+)
+MAX_WEAK_SIGNAL_LINE_LENGTH = 60
+
+# Lines outside the footer are only dropped with at least this many signals.
+MIN_BODY_LINE_SIGNALS = 2
+
+_QUOTED_LINE = re.compile(r"^\s*>")
+_SEPARATOR_LINE = re.compile(r"^\s*[-=_*~#.•|]{3,}\s*$")
+_URL = re.compile(r"https?://([^/\s<>\"')\]]+)[^\s<>\"')\]]*")
+_SPACES = re.compile(r"[ \t\u00a0\u200b\u200c\u200d\ufeff]+")
+
+# URLs longer than this are collapsed to their host name.
+MAX_URL_LENGTH = 40
+
+
+def _collapse_url(match: re.Match) -> str:
+    url = match.group(0)
+    if len(url) <= MAX_URL_LENGTH:
+        return url
+    return f"[{match.group(1)}]"
+
+
+def _find_tail(text: str) -> int | None:
+    """
+    Position where the quoted reply chain or signature starts, if any.
+
+    In a forward, a signature marker could precede the forwarded message,
+    so only reply headers before the forward count.
+    """
+    starts = []
+    reply_header = find_reply_header(text)
+    if reply_header:
+        starts.append(reply_header.start())
+    if not FORWARD_MARKER.search(text):
+        signature = _SIGNATURE_MARKER.search(text)
+        if signature:
+            starts.append(signature.start())
+    return min(starts) if starts else None
+
+
+def _footer_signals(line: str) -> int:
+    """Count the boilerplate signals in a line."""
+    signals = len(_FOOTER_SIGNAL.findall(line))
+    if len(line) <= MAX_WEAK_SIGNAL_LINE_LENGTH:
+        signals += len(_WEAK_FOOTER_SIGNAL.findall(line))
+    return signals
+
+
+def _is_short_paragraph(paragraph: list[str]) -> bool:
+    # Addresses, company names and link bars inside a footer
+    return len(paragraph) <= 4 and all(
+        len(line) <= MAX_WEAK_SIGNAL_LINE_LENGTH for line in paragraph
+    )
+
+
+def _footer_start(paragraphs: list[list[str]]) -> int:
+    """
+    Index of the first paragraph of the trailing footer block.
+
+    The footer is the run of paragraphs at the end of the email that carry
+    a boilerplate signal, together with short paragraphs between them (such
+    as a postal address). It ends at the last substantive paragraph.
+    """
+    start = len(paragraphs)
+    for index in range(len(paragraphs) - 1, -1, -1):
+        paragraph = paragraphs[index]
+        if any(_footer_signals(line) for line in paragraph):
+            start = index
+        elif not _is_short_paragraph(paragraph):
+            break
+    return start
+
+
+def compact_text(text: str) -> str:
+    """
+    Strip boilerplate from an email body before prompt construction.
+
+    Removes quoted reply chains, signatures, decorative separators and the
+    trailing footer block (unsubscribe links, legal disclaimers, see
+    ``_footer_start``), collapses long (tracking) URLs to their host name
+    and squeezes whitespace. Inside the body, only lines with several
+    boilerplate signals are dropped, so ordinary sentences that happen to
+    mention e.g. "terms and conditions" are kept.
+
+    Args:
+        text: Plain text email body
+
+    Returns:
+        Compacted body
+    """
+    if not text:
+        return text
+
+    # Cut reply chains and signatures, unless the marker is all there is
+    tail = _find_tail(text)
+    if tail is not None and text[:tail].strip():
+        text = text[:tail]
+
+    text = _URL.sub(_collapse_url, text)
+
+    paragraphs = []
+    current = []
+    for line in text.splitlines():
+        line = _SPACES.sub(" ", line).strip()
+        if not line:
+            if current:
+                paragraphs.append(current)
+                current = []
+            continue
+        if _QUOTED_LINE.match(line) or _SEPARATOR_LINE.match(line):
+            continue
+        current.append(line)
+    if current:
+        paragraphs.append(current)
+
+    paragraphs = paragraphs[:_footer_start(paragraphs)]
+    kept = []
+    for paragraph in paragraphs:
+        lines = [
+            line for line in paragraph
+            if _footer_signals(line) < MIN_BODY_LINE_SIGNALS
+        ]
+        if lines:
+            kept.append("\n".join(lines))
+
+    return "\n\n".join(kept).strip()
+
+
+def compact_email(email: dict) -> dict:
+    """
+    Return a copy of an email with a compacted body.
+
+    Threads are compacted message by message, so a signature in one message
+    does not cut off the rest of the conversation. The copy carries
+    ``tokens_saved``, the estimated number of input tokens removed by
+    compaction, which is also recorded in metrics.
+    """
+    compacted = email.copy()
+    body = email.get("body", "")
+    if not body:
+        compacted["tokens_saved"] = 0
+        return compacted
+
+    if email.get("thread_messages"):
+        thread_messages = [
+            {**message, "body": compact_text(message["body"])}
+            for message in email["thread_messages"]
+        ]
+        thread_messages = [message for message in thread_messages if message["body"]]
+        compacted["thread_messages"] = thread_messages
+        compacted["body"] = format_thread_body(thread_messages)
+    else:
+        compacted["body"] = compact_text(body)
+    tokens_saved = estimate_tokens(body) - estimate_tokens(compacted["body"])
+    compacted["tokens_saved"] = tokens_saved
+    metrics.observe("compaction_tokens_saved", tokens_saved)
+    return compacted
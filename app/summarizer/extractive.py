@@ -0,0 +1,110 @@
+import math
+import re
+from collections import Counter
+
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD = re.compile(r"[a-z0-9][a-z0-9'-]+")
+
+# Longest sentence kept verbatim in an extractive summary.
+MAX_SENTENCE_LENGTH = 200
+
+# Sentences scored per email; later sentences are ignored.
+MAX_SENTENCES = 200
+
+# Score boost for the first sentence, which usually states the point.
+LEAD_BONUS = 0.2
+
+_STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been
+before being below between both but by can could did do does doing down during
+each few for from further had has have having he her here hers him his how i
+if in into is it its itself just me more most my no nor not now of off on once
+only or other our ours out over own same she should so some such than that the
+their theirs them then there these they this those through to too under until
+up very was we were what when where which while who whom why will with would
+you your yours
+""".split())
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split text into sentences and standalone lines."""
+    return [sentence.strip() for sentence in _SENTENCE_BREAK.split(text) if sentence.strip()]
+
+
+def _shorten(sentence: str) -> str:
+    if len(sentence) <= MAX_SENTENCE_LENGTH:
+        return sentence
+    return sentence[:MAX_SENTENCE_LENGTH].rsplit(" ", 1)[0] + "..."
+
+
+def format_summary(sentences: list[str]) -> str:
+    """Format sentences like a model summary (bullets when multi-line)."""
+    if len(sentences) == 1:
+        return _shorten(sentences[0])
+    return "\n".join(f"• {_shorten(sentence)}" for sentence in sentences)
+
+
+def rank_sentences(sentences: list[str]) -> list[int]:
+    """
+    Rank sentences by TF-IDF salience, best first.
+
+    Each sentence is treated as a document: a sentence scores highly when it
+    contains terms that are frequent in the email but concentrated in few
+    sentences. Scores are length-normalized so long sentences do not win by
+    size alone.
+    """
+    term_counts = [
+        Counter(word for word in _WORD.findall(sentence.lower()) if word not in _STOPWORDS)
+        for sentence in sentences
+    ]
+    document_frequency = Counter()
+    for counts in term_counts:
+        document_frequency.update(counts.keys())
+
+    total = len(sentences)
+    idf = {
+        term: math.log((1 + total) / (1 + frequency)) + 1
+        for term, frequency in document_frequency.items()
+    }
+    email_frequency = Counter()
+    for counts in term_counts:
+        email_frequency.update(counts)
+
+    scores = []
+    for position, counts in enumerate(term_counts):
+        length = sum(counts.values())
+        if not length:
+            scores.append(0.0)
+            continue
+        weight = sum(count * idf[term] * email_frequency[term] for term, count in counts.items())
+        score = weight / (length * sum(email_frequency.values()))
+        if position == 0:
+            score *= 1 + LEAD_BONUS
+        scores.append(score)
+
+    return sorted(range(total), key=lambda index: (-scores[index], index))
+
+
+def extractive_summary(email: dict, num_lines: int) -> str:
+    """
+    Summarize an email without a model call.
+
+    Picks the ``num_lines`` most salient sentences (see ``rank_sentences``)
+    and returns them in their original order.
+
+    Args:
+        email: Email dictionary
+        num_lines: Number of summary lines
+
+    Returns:
+        Summary text
+    """
+    text = email.get("body") or email.get("snippet") or email.get("subject") or ""
+    sentences = split_sentences(text)[:MAX_SENTENCES]
+    if not sentences:
+        return "Summary unavailable"
+
+    if len(sentences) > num_lines:
+        chosen = sorted(rank_sentences(sentences)[:num_lines])
+        sentences = [sentences[index] for index in chosen]
+    return format_summary(sentences)
@@ -108,3 +108,28 @@ Your summaries are:
 
 Always use the exact output format requested with [SUMMARY N] tags.
 Always output exactly the number of lines requested per email, no more and no less."""
+
+
+def get_chunk_summary_prompt(subject: str, chunk: str, part: int, total_parts: int) -> str:
+    """
+    Generate prompt for condensing one section of a long email.
+
+    Args:
+        subject: Subject of the email the section belongs to
+        chunk: Text of the section
+        part: 1-based position of the section in the email
+        total_parts: Total number of sections being condensed
+
+    Returns:
+        Formatted prompt string
+    """
+    return f"""The following is part {part} of {total_parts} of a long email with the subject "{subject}".
+
+Extract the key facts from this part as a few short bullet points (•).
+State the actual content: specific names, numbers, steps, recommendations, action items and deadlines.
+Skip greetings, navigation text, ads and footers. Do not reference "the email" or "this part".
+
+Part {part}:
+{chunk}
+
+Key facts:"""
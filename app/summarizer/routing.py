@@ -0,0 +1,67 @@
+import re
+
+from app.config import get_settings
+from app.summarizer.tokens import estimate_tokens
+
+settings = get_settings()
+
+EXTRACTIVE = "extractive"
+FAST = "fast"
+STANDARD = "standard"
+CHUNK = "chunk"
+
+# Upper bound on output tokens for a single batch call.
+MAX_OUTPUT_TOKENS = 4096
+
+# Output tokens taken by the [SUMMARY N] tags around each summary.
+SUMMARY_TAG_TOKENS = 15
+
+_RECEIPT_SUBJECT = re.compile(
+    r"\b(?:receipt|invoice|order (?:confirmation|confirmed|#)|your order"
+    r"|payment (?:received|confirmation)|shipping confirmation|has shipped"
+    r"|verification code|sign-?in code)\b",
+    re.IGNORECASE,
+)
+
+
+def route_email(email: dict, num_lines: int) -> str:
+    """
+    Pick a route for an email from its measured size.
+
+    Trivial emails (one-liners, short receipts) skip the model entirely,
+    long emails or long summaries go to the standard model and everything
+    else goes to the fast model.
+    """
+    body = email.get("body", "")
+    if len(body) <= settings.trivial_max_chars:
+        return EXTRACTIVE
+    if (
+        len(body) <= settings.receipt_max_chars
+        and _RECEIPT_SUBJECT.search(email.get("subject", ""))
+    ):
+        return EXTRACTIVE
+    if len(body) >= settings.standard_min_chars or num_lines >= settings.standard_min_lines:
+        return STANDARD
+    return FAST
+
+
+def model_for_route(route: str) -> str:
+    """Get the model configured for a route (chunk condensation uses the fast model)."""
+    if route == STANDARD:
+        return settings.model_standard
+    return settings.model_fast
+
+
+def output_budget(emails: list[dict], num_lines: int) -> int:
+    """
+    Estimate the output tokens needed to summarize a batch.
+
+    Each email gets ``tokens_per_summary_line`` per requested line, but never
+    much more than its body, since a summary is shorter than its source.
+    """
+    per_line = settings.tokens_per_summary_line
+    total = 0
+    for email in emails:
+        body_tokens = estimate_tokens(email.get("body", ""))
+        total += min(num_lines * per_line, body_tokens + per_line) + SUMMARY_TAG_TOKENS
+    return min(MAX_OUTPUT_TOKENS, total)
@@ -0,0 +1,193 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
+from app.config import get_settings
+from app.metrics import metrics
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+LANES = (INTERACTIVE, BULK)
+
+
+class _Ticket:
+    """A queued request for one model call."""
+
+    __slots__ = ("user_id", "cost", "lane", "future", "enqueued_at")
+
+    def __init__(self, user_id, cost: int, lane: str, future: asyncio.Future):
+        self.user_id = user_id
+        self.cost = cost
+        self.lane = lane
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+
+class FairScheduler:
+    """
+    Per-user fair scheduler for shared model capacity.
+
+    Model calls are admitted up to ``max_concurrent`` at a time. When capacity
+    is exhausted, waiting calls are queued per user and served with deficit
+    round-robin, using the estimated token cost of each call, so a user
+    submitting a large job cannot starve everyone else. Calls in the
+    interactive lane are always served before the bulk lane.
+    """
+
+    def __init__(self, max_concurrent: int, quantum: int):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        if quantum < 1:
+            raise ValueError("quantum must be at least 1")
+
+        self.max_concurrent = max_concurrent
+        self.quantum = quantum
+        self._active = 0
+        # Per lane: user_id -> queue of tickets, in round-robin order
+        self._queues: dict[str, OrderedDict] = {lane: OrderedDict() for lane in LANES}
+        self._deficits: dict[str, dict] = {lane: {} for lane in LANES}
+
+    @property
+    def active(self) -> int:
+        """Number of model calls currently admitted."""
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        """Number of model calls waiting for capacity."""
+        return sum(
+            len(queue)
+            for lane in LANES
+            for queue in self._queues[lane].values()
+        )
+
+    @asynccontextmanager
+    async def slot(self, user_id, cost: int, interactive: bool = True):
+        """Hold a slot of model capacity for the duration of the block."""
+        await self.acquire(user_id, cost, interactive)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, user_id, cost: int, interactive: bool = True) -> float:
+        """
+        Wait for a slot of model capacity.
+
+        Args:
+            user_id: Identifier of the user the call is made for
+            cost: Estimated token cost of the call
+            interactive: Whether the call belongs to a small interactive request
+
+        Returns:
+            Seconds spent waiting in the queue
+        """
+        lane = INTERACTIVE if interactive else BULK
+        started = time.monotonic()
+
+        if self._active < self.max_concurrent and not self.waiting:
+            self._active += 1
+            self._record_wait(lane, 0.0)
+            return 0.0
+
+        future = asyncio.get_running_loop().create_future()
+        ticket = _Ticket(user_id, max(1, cost), lane, future)
+        self._queues[lane].setdefault(user_id, deque()).append(ticket)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted just as we were cancelled: hand it back.
+                self.release()
+            else:
+                self._remove(ticket)
+            raise
+
+        waited = time.monotonic() - started
+        self._record_wait(lane, waited)
+        return waited
+
+    def release(self) -> None:
+        """Return a slot and admit the next waiting calls."""
+        self._active -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Admit queued calls while capacity is available."""
+        while self._active < self.max_concurrent:
+            ticket = self._next_ticket()
+            if ticket is None:
+                return
+            self._active += 1
+            ticket.future.set_result(None)
+
+    def _next_ticket(self) -> _Ticket | None:
+        """Pick the next ticket, serving the interactive lane first."""
+        for lane in LANES:
+            ticket = self._next_from_lane(lane)
+            if ticket is not None:
+                return ticket
+        return None
+
+    def _next_from_lane(self, lane: str) -> _Ticket | None:
+        """Deficit round-robin over the per-user queues of a lane."""
+        queues = self._queues[lane]
+        deficits = self._deficits[lane]
+
+        while queues:
+            user_id, queue = next(iter(queues.items()))
+            # Cancelled callers leave their ticket queued until their task
+            # runs again; they must not be granted a slot.
+            while queue and queue[0].future.done():
+                queue.popleft()
+            if not queue:
+                del queues[user_id]
+                deficits.pop(user_id, None)
+                continue
+            ticket = queue[0]
+            deficit = deficits.get(user_id, 0)
+
+            if ticket.cost <= deficit:
+                queue.popleft()
+                if queue:
+                    deficits[user_id] = deficit - ticket.cost
+                else:
+                    # An emptied queue forfeits its remaining deficit.
+                    del queues[user_id]
+                    deficits.pop(user_id, None)
+                return ticket
+
+            deficits[user_id] = deficit + self.quantum
+            queues.move_to_end(user_id)
+
+        return None
+
+    def _remove(self, ticket: _Ticket) -> None:
+        """Drop a cancelled ticket from its queue."""
+        queues = self._queues[ticket.lane]
+        queue = queues.get(ticket.user_id)
+        if queue is None:
+            return
+        try:
+            queue.remove(ticket)
+        except ValueError:
+            return
+        if not queue:
+            del queues[ticket.user_id]
+            self._deficits[ticket.lane].pop(ticket.user_id, None)
+
+    def _record_wait(self, lane: str, seconds: float) -> None:
+        metrics.observe("scheduler_queue_wait_seconds", seconds, lane=lane)
+
+
+@lru_cache
+def get_scheduler() -> FairScheduler:
+    """Get the process-wide model call scheduler."""
+    settings = get_settings()
+    return FairScheduler(
+        max_concurrent=settings.model_max_concurrency,
+        quantum=settings.scheduler_quantum_tokens,
+    )
@@ -1,11 +1,51 @@
 import re
+import time
 import asyncio
-import anthropic
+import logging
 from app.config import get_settings
-from app.summarizer.prompts import get_summarization_prompt, get_system_prompt
+from app.metrics import metrics
+from app.summarizer.cache import cache_summaries, get_cached_summaries
+from app.summarizer.chunking import split_into_at_most
+from app.summarizer.compaction import compact_email
+from app.summarizer.extractive import extractive_summary
+from app.summarizer.prompts import (
+    get_chunk_summary_prompt,
+    get_summarization_prompt,
+    get_system_prompt,
+)
+from app.summarizer.routing import (
+    CHUNK,
+    EXTRACTIVE,
+    FAST,
+    STANDARD,
+    model_for_route,
+    output_budget,
+    route_email,
+)
+from app.summarizer.scheduler import get_scheduler
+from app.resilience import CircuitBreaker, CircuitOpenError, RetryBudget, call_with_retries
+from app.singleflight import SingleFlight
+from app.state.backend import wait_for_tokens
+from app.summarizer.tokens import estimate_tokens
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Concurrent requests condensing the same long email share the work
+_condense_flight = SingleFlight("condense")
+
+# Shared by all model calls of this process
+_model_breaker = CircuitBreaker(
+    "model",
+    failure_threshold=settings.circuit_failure_threshold,
+    reset_timeout=settings.circuit_reset_seconds,
+)
+_model_budget = RetryBudget(
+    "model",
+    ratio=settings.retry_budget_ratio,
+    min_retries=settings.retry_budget_min,
+)
+
 # Truncate email bodies to reduce token usage
 MAX_BODY_LENGTH = 1000
 
@@ -45,18 +85,210 @@ def parse_summaries(response_text: str, expected_count: int) -> list[str]:
     return summaries
 
 
+def rate_limits_enabled() -> bool:
+    """Whether shared model rate limits are configured."""
+    return bool(settings.model_requests_per_minute or settings.model_tokens_per_minute)
+
+
+async def wait_for_rate_limits(cost: int) -> None:
+    """Wait for the shared per-minute request and token budgets of the API key."""
+    if settings.model_requests_per_minute:
+        limit = settings.model_requests_per_minute
+        await wait_for_tokens("ratelimit:model_requests", limit, limit / 60)
+    if settings.model_tokens_per_minute:
+        limit = settings.model_tokens_per_minute
+        await wait_for_tokens("ratelimit:model_tokens", limit, limit / 60, cost)
+
+
+async def create_message(
+    client,
+    route: str,
+    prompt: str,
+    max_tokens: int,
+    user_id: int | None = None,
+    interactive: bool = True,
+    system: str | None = None,
+):
+    """
+    Make one scheduled model call for a route.
+
+    Calls wait for the shared rate limits (see ``wait_for_rate_limits``)
+    while holding their scheduler slot, so the fair order is kept. Latency
+    and input/output token usage are recorded per route.
+    """
+    import anthropic
+
+    scheduler = get_scheduler()
+    cost = estimate_tokens(prompt) + max_tokens
+    extra = {}
+    if system:
+        cost += estimate_tokens(system)
+        extra["system"] = system
+
+    async with scheduler.slot(user_id, cost, interactive=interactive):
+        await wait_for_rate_limits(cost)
+        started = time.perf_counter()
+        try:
+            message = await client.messages.create(
+                model=model_for_route(route),
+                max_tokens=max_tokens,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ],
+                **extra,
+            )
+        except anthropic.APITimeoutError:
+            metrics.increment("timeouts", call="model")
+            raise
+        metrics.observe("route_latency_seconds", time.perf_counter() - started, route=route)
+
+    usage = getattr(message, "usage", None)
+    if usage is not None:
+        metrics.increment("route_input_tokens", usage.input_tokens, route=route)
+        metrics.increment("route_output_tokens", usage.output_tokens, route=route)
+    return message
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Whether a Claude API error is worth retrying (rate limit, timeout, 5xx)."""
+    import anthropic
+
+    return isinstance(error, (
+        anthropic.RateLimitError,
+        anthropic.APIConnectionError,
+        anthropic.InternalServerError,
+    ))
+
+
+async def create_message_with_retries(client, route: str, *args, **kwargs):
+    """
+    Make a model call, retrying transient errors with exponential backoff.
+
+    Gives up after ``model_max_retries`` retries, or when the model retry
+    budget is spent, and re-raises the last error. Repeated failures open
+    the model circuit breaker, after which calls fail fast with
+    ``CircuitOpenError`` (see ``app.resilience``).
+    """
+    return await call_with_retries(
+        lambda: create_message(client, route, *args, **kwargs),
+        "model",
+        is_transient_error,
+        max_retries=settings.model_max_retries,
+        base_delay=settings.model_retry_base_delay,
+        budget=_model_budget,
+        breaker=_model_breaker,
+    )
+
+
+def should_fall_back(error: BaseException) -> bool:
+    """Whether a failed model call may be replaced by an extractive summary."""
+    if not settings.model_fallback_enabled:
+        return False
+    return isinstance(error, CircuitOpenError) or is_transient_error(error)
+
+
+def build_result(email: dict, summary: str, degraded: bool = False) -> dict:
+    """Combine email metadata with its summary."""
+    return {
+        "id": email.get("id"),
+        "subject": email.get("subject", "No Subject"),
+        "date": email.get("date", "Unknown"),
+        "snippet": email.get("snippet", ""),
+        "summary": summary,
+        "tokens_saved": email.get("tokens_saved", 0),
+        "message_count": email.get("message_count", 1),
+        "degraded": degraded,
+    }
+
+
+async def condense_long_email(
+    client,
+    email: dict,
+    user_id: int | None = None,
+    interactive: bool = True,
+) -> str:
+    """
+    Condense a long email body by summarizing its sections in parallel.
+
+    The body is split at paragraph/section boundaries into at most
+    ``max_chunks_per_email`` chunks that cover the whole email (see
+    ``split_into_at_most``), each summarized with a bounded output budget.
+    The returned notes replace the body in the batch prompt, which then
+    acts as the reduce step.
+
+    Args:
+        client: Async Anthropic client
+        email: Email dictionary with a long body
+        user_id: ID of the user the summaries are for, used for fair scheduling
+        interactive: Whether the request is a small interactive one
+
+    Returns:
+        Condensed notes covering the whole email
+    """
+    subject = email.get("subject", "No Subject")
+    chunks, dropped = split_into_at_most(
+        email.get("body", ""),
+        settings.max_chunks_per_email,
+        settings.chunk_size,
+        settings.max_chunk_size,
+    )
+    if dropped:
+        logger.warning("Dropped %d characters of email %s", dropped, email.get("id"))
+        metrics.increment("long_email_dropped_chars", dropped)
+
+    async def summarize_chunk(part: int, chunk: str) -> str:
+        prompt = get_chunk_summary_prompt(subject, chunk, part, len(chunks))
+        message = await create_message_with_retries(
+            client,
+            CHUNK,
+            prompt,
+            settings.chunk_summary_tokens,
+            user_id=user_id,
+            interactive=interactive,
+        )
+        if not message.content:
+            return ""
+        return message.content[0].text.strip()
+
+    notes = await asyncio.gather(*(
+        summarize_chunk(part, chunk)
+        for part, chunk in enumerate(chunks, 1)
+    ))
+    return "\n".join(note for note in notes if note)
+
+
 async def summarize_emails(
     emails: list[dict],
     num_lines: int,
     sender_email: str,
+    user_id: int | None = None,
+    interactive: bool | None = None,
 ) -> list[dict]:
     """
     Summarize each email individually using Claude API.
 
+    Bodies are first stripped of boilerplate (see ``compact_email``). Emails
+    with a summary in the shared cache are not summarized again; the rest
+    are routed by their size (see ``route_email``): trivial emails get an
+    extractive summary without a model call, the rest are batched per model.
+    Bodies longer than ``long_email_threshold`` are condensed section by
+    section (see ``condense_long_email``) instead of being truncated. Model
+    calls go through the shared fair scheduler, so large requests from one
+    user cannot starve small requests from everyone else.
+
+    Transient API errors are retried up to ``model_max_retries`` times. A
+    batch that still fails with a transient error, or while the model
+    circuit is open, falls back to extractive summaries marked as
+    ``degraded``, keeping the results of the batches that succeeded. Other
+    API errors, such as bad requests, raise ``SummarizationError``.
+
     Args:
         emails: List of email dictionaries
         num_lines: Number of lines for each email's summary
         sender_email: Email address of the sender
+        user_id: ID of the user the summaries are for, used for fair scheduling
+        interactive: Schedule in the interactive lane; by default requests
+            for at most ``interactive_max_emails`` emails are interactive
 
     Returns:
         List of dicts with email metadata and individual summaries
@@ -64,47 +296,128 @@ async def summarize_emails(
     Raises:
         SummarizationError: If summarization fails
     """
+    import anthropic
+
     if not emails:
         return []
 
     if num_lines < 1 or num_lines > 10:
         raise SummarizationError("Number of lines must be between 1 and 10")
 
-    client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
+    # Retries are handled here so they can fall back per batch
+    client = anthropic.AsyncAnthropic(
+        api_key=settings.anthropic_api_key,
+        timeout=settings.model_timeout_seconds,
+        max_retries=0,
+    )
     system_prompt = get_system_prompt()
+    if interactive is None:
+        interactive = len(emails) <= settings.interactive_max_emails
+
+    # Strip footers, disclaimers, reply chains and tracking URLs
+    if settings.compact_bodies:
+        emails = [compact_email(email) for email in emails]
+
+    # Summaries computed earlier by any worker are reused
+    results = [None] * len(emails)
+    cached = await get_cached_summaries(user_id, emails, num_lines)
+    for i, summary in cached.items():
+        results[i] = build_result(emails[i], summary)
+    if cached:
+        metrics.increment("summary_cache_hits", len(cached))
+
+    # Route each uncached email by its size; trivial ones are summarized locally
+    routes = [
+        None if results[i] else route_email(email, num_lines)
+        for i, email in enumerate(emails)
+    ]
+
+    started = time.perf_counter()
+    for i, email in enumerate(emails):
+        if routes[i] == EXTRACTIVE:
+            results[i] = build_result(email, extractive_summary(email, num_lines))
+    for route in (EXTRACTIVE, FAST, STANDARD):
+        if route in routes:
+            metrics.increment("route_emails", routes.count(route), route=route)
+    if EXTRACTIVE in routes:
+        metrics.observe("route_latency_seconds", time.perf_counter() - started, route=EXTRACTIVE)
+
+    # Condense long emails in parallel; their notes are bounded by the
+    # chunk output budget so they skip truncation below. Emails that fail
+    # to condense are truncated instead.
+    long_indexes = []
+    if settings.long_email_mode:
+        long_indexes = [
+            i for i, email in enumerate(emails)
+            if routes[i] in (FAST, STANDARD)
+            and len(email.get("body", "")) > settings.long_email_threshold
+        ]
+
+    condensed = {}
+    if long_indexes:
+        notes = await asyncio.gather(
+            *(
+                _condense_flight.do(
+                    (user_id, emails[i].get("id"), hash(emails[i]["body"])),
+                    lambda email=emails[i]: condense_long_email(
+                        client, email, user_id, interactive
+                    ),
+                )
+                for i in long_indexes
+            ),
+            return_exceptions=True,
+        )
+        for i, note in zip(long_indexes, notes):
+            if should_fall_back(note):
+                logger.warning("Condensing email %s failed: %s", emails[i].get("id"), note)
+                continue
+            if isinstance(note, (anthropic.APIError, CircuitOpenError)):
+                raise SummarizationError(f"Claude API error: {str(note)}")
+            if isinstance(note, BaseException):
+                raise SummarizationError(f"Summarization failed: {str(note)}")
+            condensed[i] = note
 
     # Truncate email bodies to reduce token usage
-    truncated_emails = []
-    for email in emails:
+    truncated_emails = {}
+    for i, email in enumerate(emails):
+        if routes[i] not in (FAST, STANDARD):
+            continue
         truncated = email.copy()
+        if condensed.get(i):
+            truncated["body"] = condensed[i]
+            truncated_emails[i] = truncated
+            continue
         body = truncated.get("body", truncated.get("snippet", ""))
         if len(body) > MAX_BODY_LENGTH:
             truncated["body"] = body[:MAX_BODY_LENGTH] + "..."
-        truncated_emails.append(truncated)
+        truncated_emails[i] = truncated
 
-    # Process in small batches to avoid rate limits
+    # Process in small batches per route to avoid rate limits
     batch_size = 5  # Smaller batches to stay under rate limit
-    all_results = []
+    batches = []
+    for route in (FAST, STANDARD):
+        indexes = [i for i in truncated_emails if routes[i] == route]
+        for batch_start in range(0, len(indexes), batch_size):
+            batches.append((route, indexes[batch_start:batch_start + batch_size]))
 
-    for batch_start in range(0, len(truncated_emails), batch_size):
-        batch_emails = truncated_emails[batch_start:batch_start + batch_size]
+    for batch_number, (route, batch_indexes) in enumerate(batches):
+        batch_emails = [truncated_emails[i] for i in batch_indexes]
         prompt = get_summarization_prompt(batch_emails, num_lines, sender_email)
 
-        # Add delay between batches to avoid rate limits (except for first batch)
-        if batch_start > 0:
+        # Add delay between batches to avoid rate limits (except for first
+        # batch), unless the shared rate limits already pace the calls
+        if batch_number > 0 and not rate_limits_enabled():
             await asyncio.sleep(5)  # 5 seconds to let rate limit reset
 
         try:
-            # Adjust max_tokens based on batch size and num_lines
-            max_tokens = min(4096, len(batch_emails) * num_lines * 100)
-
-            message = client.messages.create(
-                model="claude-3-haiku-20240307",
-                max_tokens=max_tokens,
+            message = await create_message_with_retries(
+                client,
+                route,
+                prompt,
+                output_budget(batch_emails, num_lines),
+                user_id=user_id,
+                interactive=interactive,
                 system=system_prompt,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
             )
 
             if not message.content or len(message.content) == 0:
@@ -114,20 +427,27 @@ async def summarize_emails(
             summaries = parse_summaries(response_text, len(batch_emails))
 
             # Match summaries with emails
-            for i, email in enumerate(batch_emails):
-                summary = summaries[i] if i < len(summaries) else "Summary unavailable"
-                all_results.append({
-                    "subject": email.get("subject", "No Subject"),
-                    "date": email.get("date", "Unknown"),
-                    "snippet": email.get("snippet", ""),
-                    "summary": summary,
-                })
-
-        except anthropic.APIError as e:
-            raise SummarizationError(f"Claude API error: {str(e)}")
+            batch_summaries = {}
+            for position, i in enumerate(batch_indexes):
+                summary = summaries[position] if position < len(summaries) else "Summary unavailable"
+                results[i] = build_result(emails[i], summary)
+                if position < len(summaries):
+                    batch_summaries[i] = summary
+            await cache_summaries(user_id, emails, batch_summaries, num_lines)
+
+        except (anthropic.APIError, CircuitOpenError) as e:
+            # Only outages degrade; bad requests and auth errors are raised
+            if not should_fall_back(e):
+                raise SummarizationError(f"Claude API error: {str(e)}")
+            # Degrade this batch to local summaries and keep going
+            logger.warning("Falling back to extractive summaries: %s", e)
+            metrics.increment("model_fallbacks", len(batch_indexes), route=route)
+            for i in batch_indexes:
+                summary = extractive_summary(emails[i], num_lines)
+                results[i] = build_result(emails[i], summary, degraded=True)
         except SummarizationError:
             raise
         except Exception as e:
             raise SummarizationError(f"Summarization failed: {str(e)}")
 
-    return all_results
+    return results
@@ -0,0 +1,28 @@
+import importlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Heavy client libraries that are imported lazily on first use. Warming them
+# in the background after startup keeps worker boot fast without making the
+# first real request pay the import cost.
+HEAVY_MODULES = (
+    "googleapiclient.discovery",
+    "google_auth_httplib2",
+    "google_auth_oauthlib.flow",
+    "google.oauth2.credentials",
+    "google.auth.transport.requests",
+    "anthropic",
+    "bs4",
+    "cryptography.fernet",
+    "httpx",
+)
+
+
+def warm_imports() -> None:
+    """Import heavy client libraries so later lazy imports are free."""
+    for module_name in HEAVY_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except Exception:
+            logger.exception("Failed to warm import %s", module_name)
@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, EmailStr
+
+from app.db.database import get_db
+from app.auth.dependencies import require_auth
+from app.watch.service import (
+    add_watched_sender,
+    list_watched_senders,
+    remove_watched_sender,
+)
+
+router = APIRouter(prefix="/api/watched", tags=["watched"])
+
+
+class WatchRequest(BaseModel):
+    sender_email: EmailStr
+    num_lines: int = 2
+
+
+class WatchedSenderResponse(BaseModel):
+    sender_email: str
+    num_lines: int
+    last_synced_at: str | None
+
+
+def _to_response(watched) -> WatchedSenderResponse:
+    return WatchedSenderResponse(
+        sender_email=watched.sender_email,
+        num_lines=watched.num_lines,
+        last_synced_at=(
+            watched.last_synced_at.isoformat() if watched.last_synced_at else None
+        ),
+    )
+
+
+@router.get("", response_model=list[WatchedSenderResponse])
+async def list_watched(
+    user=Depends(require_auth),
+    db: AsyncSession = Depends(get_db),
+):
+    """List the current user's watched senders."""
+    return [_to_response(watched) for watched in await list_watched_senders(db, user.id)]
+
+
+@router.post("", response_model=WatchedSenderResponse)
+async def watch_sender(
+    data: WatchRequest,
+    user=Depends(require_auth),
+    db: AsyncSession = Depends(get_db),
+):
+    """Watch a sender so its emails are summarized ahead of time."""
+    if data.num_lines < 1 or data.num_lines > 10:
+        raise HTTPException(
+            status_code=400,
+            detail="Number of lines must be between 1 and 10",
+        )
+
+    watched = await add_watched_sender(db, user.id, data.sender_email, data.num_lines)
+    return _to_response(watched)
+
+
+@router.delete("/{sender_email}")
+async def unwatch_sender(
+    sender_email: str,
+    user=Depends(require_auth),
+    db: AsyncSession = Depends(get_db),
+):
+    """Stop watching a sender."""
+    if not await remove_watched_sender(db, user.id, sender_email):
+        raise HTTPException(status_code=404, detail="Sender is not watched")
+    return {"status": "ok"}
@@ -0,0 +1,296 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.db.database import async_session_maker
+from app.db.models import User, WatchedSender, SummaryRecord
+from app.gmail.parser import THREAD_ID_PREFIX
+from app.gmail.service import fetch_emails_from_sender
+from app.summarizer.service import summarize_emails
+from app.search.index import index_emails, index_summaries
+from app.state.backend import get_state_backend
+from app.summaries.service import (
+    get_stored_message_ids,
+    store_summaries,
+    summary_to_dict,
+)
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Overlap between incremental fetches; duplicates are skipped by message ID.
+SYNC_OVERLAP = timedelta(hours=1)
+
+# Shared job queue of watched sender IDs to sync
+WATCH_QUEUE = "watch:jobs"
+WATCH_LEADER_LOCK = "watch:leader"
+
+
+async def get_watched_sender(
+    db: AsyncSession,
+    user_id: int,
+    sender_email: str,
+) -> WatchedSender | None:
+    """Get a user's watched sender by address."""
+    stmt = select(WatchedSender).where(
+        WatchedSender.user_id == user_id,
+        WatchedSender.sender_email == sender_email.lower(),
+    )
+    result = await db.execute(stmt)
+    return result.scalar_one_or_none()
+
+
+async def list_watched_senders(db: AsyncSession, user_id: int) -> list[WatchedSender]:
+    """List all senders watched by a user."""
+    stmt = (
+        select(WatchedSender)
+        .where(WatchedSender.user_id == user_id)
+        .order_by(WatchedSender.sender_email)
+    )
+    result = await db.execute(stmt)
+    return list(result.scalars())
+
+
+async def add_watched_sender(
+    db: AsyncSession,
+    user_id: int,
+    sender_email: str,
+    num_lines: int = 2,
+) -> WatchedSender:
+    """Watch a sender, or update the summary length of an existing watch."""
+    watched = await get_watched_sender(db, user_id, sender_email)
+    if watched:
+        watched.num_lines = num_lines
+    else:
+        watched = WatchedSender(
+            user_id=user_id,
+            sender_email=sender_email.lower(),
+            num_lines=num_lines,
+        )
+        db.add(watched)
+
+    await db.commit()
+    await db.refresh(watched)
+    return watched
+
+
+async def remove_watched_sender(
+    db: AsyncSession,
+    user_id: int,
+    sender_email: str,
+) -> bool:
+    """Stop watching a sender (its stored summaries are kept)."""
+    watched = await get_watched_sender(db, user_id, sender_email)
+    if not watched:
+        return False
+
+    await db.delete(watched)
+    await db.commit()
+    return True
+
+
+async def get_precomputed_summaries(
+    db: AsyncSession,
+    user_id: int,
+    sender_email: str,
+    num_lines: int,
+    limit: int,
+) -> list[dict]:
+    """
+    Get the most recent stored summaries of single emails from a sender,
+    newest first.
+
+    Summaries of whole threads (stored by thread mode) are excluded, since
+    they cover the same messages.
+    """
+    stmt = (
+        select(SummaryRecord)
+        .where(
+            SummaryRecord.user_id == user_id,
+            SummaryRecord.sender_email == sender_email.lower(),
+            SummaryRecord.num_lines == num_lines,
+            SummaryRecord.message_id.not_like(f"{THREAD_ID_PREFIX}%"),
+        )
+        .order_by(SummaryRecord.received_at.desc(), SummaryRecord.id.desc())
+        .limit(limit)
+    )
+    result = await db.execute(stmt)
+    fields = ("id", "subject", "date", "snippet", "summary")
+    return [summary_to_dict(record, fields) for record in result.scalars()]
+
+
+async def sync_watched_sender(db: AsyncSession, watched: WatchedSender) -> int:
+    """
+    Fetch and summarize new emails from a watched sender.
+
+    Only emails received since the previous sync are fetched, and emails
+    that already have a stored summary are skipped.
+
+    Returns:
+        Number of new summaries stored
+    """
+    user = await db.get(User, watched.user_id)
+    if not user:
+        return 0
+
+    after = None
+    if watched.last_synced_at:
+        after = watched.last_synced_at - SYNC_OVERLAP
+
+    started_at = datetime.utcnow()
+    emails = await fetch_emails_from_sender(
+        user=user,
+        sender_email=watched.sender_email,
+        max_results=settings.watch_max_emails,
+        after=after,
+    )
+
+    # Commit before summarizing, which can take minutes in the bulk lane;
+    # an open write transaction would lock SQLite for every other request
+    await index_emails(db, watched.user_id, emails)
+    await db.commit()
+
+    stored = await get_stored_message_ids(
+        db,
+        watched.user_id,
+        watched.num_lines,
+        [email["id"] for email in emails],
+    )
+
+    added = 0
+    new_emails = [email for email in emails if email["id"] not in stored]
+    if new_emails:
+        summaries = await summarize_emails(
+            emails=new_emails,
+            num_lines=watched.num_lines,
+            sender_email=watched.sender_email,
+            user_id=watched.user_id,
+            interactive=False,
+        )
+        added = await store_summaries(
+            db,
+            user_id=watched.user_id,
+            sender_email=watched.sender_email,
+            num_lines=watched.num_lines,
+            emails=new_emails,
+            summaries=summaries,
+        )
+        await index_summaries(db, watched.user_id, summaries)
+
+    watched.last_synced_at = started_at
+    await db.commit()
+    return added
+
+
+def is_off_peak(now: datetime) -> bool:
+    """Whether the given UTC time falls in the configured off-peak window."""
+    start = settings.watch_offpeak_start_hour
+    end = settings.watch_offpeak_end_hour
+    if start == end:
+        return True
+    if start < end:
+        return start <= now.hour < end
+    # Window wraps around midnight
+    return now.hour >= start or now.hour < end
+
+
+async def sync_watched_sender_by_id(watched_id: int) -> int:
+    """Sync one watched sender in its own session, logging failures."""
+    async with async_session_maker() as db:
+        watched = await db.get(WatchedSender, watched_id)
+        if not watched:
+            return 0
+        try:
+            return await sync_watched_sender(db, watched)
+        except Exception:
+            logger.exception("Failed to sync watched sender %s", watched_id)
+            return 0
+
+
+async def enqueue_due_senders() -> int:
+    """
+    Queue a sync job for every watched sender not synced within the sync
+    interval.
+
+    Senders that already have a pending job are skipped, so a slow sync is
+    not queued again by the next poll.
+
+    Returns:
+        Number of jobs queued
+    """
+    cutoff = datetime.utcnow() - timedelta(minutes=settings.watch_sync_interval_minutes)
+
+    async with async_session_maker() as db:
+        stmt = select(WatchedSender.id).where(
+            (WatchedSender.last_synced_at.is_(None))
+            | (WatchedSender.last_synced_at < cutoff)
+        )
+        due_ids = list((await db.execute(stmt)).scalars())
+
+    backend = get_state_backend()
+    queued = 0
+    for watched_id in due_ids:
+        pending = await backend.set(
+            f"watch:pending:{watched_id}",
+            b"1",
+            ttl=settings.watch_sync_interval_minutes * 60,
+            only_if_absent=True,
+        )
+        if pending:
+            await backend.enqueue(WATCH_QUEUE, str(watched_id).encode())
+            queued += 1
+
+    return queued
+
+
+async def run_watch_worker() -> None:
+    """Background loop that runs queued watched sender syncs."""
+    backend = get_state_backend()
+    while True:
+        try:
+            job = await backend.dequeue(WATCH_QUEUE, timeout=settings.watch_poll_seconds)
+        except Exception:
+            logger.exception("Failed to read the watched sender queue")
+            await asyncio.sleep(settings.watch_poll_seconds)
+            continue
+        if job is None:
+            continue
+
+        watched_id = int(job)
+        try:
+            await sync_watched_sender_by_id(watched_id)
+        finally:
+            await backend.delete(f"watch:pending:{watched_id}")
+
+
+async def run_watch_scheduler() -> None:
+    """
+    Background loop that pre-summarizes watched senders during off-peak hours.
+
+    Every worker runs a queue consumer, but only the worker holding the
+    leader lock queues due senders in each poll interval, so with several
+    workers the syncs are spread across them and each runs once.
+    """
+    backend = get_state_backend()
+    token = uuid.uuid4().hex.encode()
+    worker = asyncio.create_task(run_watch_worker())
+    try:
+        while True:
+            if is_off_peak(datetime.utcnow()):
+                try:
+                    # Held until it expires so one worker queues per interval
+                    leader = await backend.acquire_lock(
+                        WATCH_LEADER_LOCK, token, settings.watch_poll_seconds
+                    )
+                    if leader:
+                        await enqueue_due_senders()
+                except Exception:
+                    logger.exception("Watched sender sync failed")
+            await asyncio.sleep(settings.watch_poll_seconds)
+    finally:
+        worker.cancel()
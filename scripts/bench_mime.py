@@ -0,0 +1,97 @@
+"""
+Benchmark for email body extraction.
+
+Times ``extract_body`` against the previous three-scan implementation on
+the MIME cases from ``tests/mime_cases.py`` (checked by
+``tests/test_mime.py``).
+
+Real messages can be added with ``--corpus``: every ``*.eml`` file in the
+directory (for example "Download message" from Gmail) is benchmarked, and
+listed with the part chosen for its body.
+
+Usage:
+    python scripts/bench_mime.py [--corpus DIR] [--iterations 2000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.gmail.parser import (  # noqa: E402
+    decode_base64,
+    extract_body,
+    find_body_part,
+    html_to_text,
+)
+from tests.mime_cases import CASES, load_message  # noqa: E402
+
+def legacy_extract_body(payload: dict) -> str:
+    """The previous implementation: three scans of ``parts`` and recursion."""
+    if "body" in payload and payload["body"].get("data"):
+        text = decode_base64(payload["body"]["data"])
+        if "html" in payload.get("mimeType", ""):
+            text = html_to_text(text)
+        return text
+
+    parts = payload.get("parts", [])
+    for part in parts:
+        if part.get("mimeType", "") == "text/plain" and part.get("body", {}).get("data"):
+            return decode_base64(part["body"]["data"])
+    for part in parts:
+        if part.get("mimeType", "") == "text/html" and part.get("body", {}).get("data"):
+            return html_to_text(decode_base64(part["body"]["data"]))
+    for part in parts:
+        if part.get("mimeType", "").startswith("multipart/"):
+            nested = legacy_extract_body(part)
+            if nested:
+                return nested
+    return ""
+
+
+def time_per_call(fn, payload: dict, iterations: int) -> float:
+    """Return the average time of ``fn(payload)`` in microseconds."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn(payload)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def run_cases(iterations: int) -> None:
+    """Benchmark the built-in cases."""
+    print(f"{'case':<50} {'new us':>8} {'old us':>8}")
+    for name, raw, _, _ in CASES:
+        payload, attachments = load_message(raw.encode())
+        new_us = time_per_call(lambda p: extract_body(p, attachments), payload, iterations)
+        old_us = time_per_call(legacy_extract_body, payload, iterations)
+        print(f"{name:<50} {new_us:>8.1f} {old_us:>8.1f}")
+
+
+def run_corpus(directory: Path, iterations: int) -> None:
+    """Benchmark every .eml file in a directory."""
+    paths = sorted(directory.glob("*.eml"))
+    print(f"\n{len(paths)} messages in {directory}")
+    for path in paths:
+        payload, attachments = load_message(path.read_bytes())
+        part = find_body_part(payload)
+        chosen = part.get("mimeType") if part else "none"
+        new_us = time_per_call(lambda p: extract_body(p, attachments), payload, iterations)
+        old_us = time_per_call(legacy_extract_body, payload, iterations)
+        print(f"{path.name[:50]:<50} {chosen:<12} {new_us:>8.1f} {old_us:>8.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", type=Path, help="directory of .eml files to benchmark")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    run_cases(args.iterations)
+    if args.corpus:
+        run_corpus(args.corpus, max(1, args.iterations // 10))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Import-time benchmark for the application entry point.
+
+Runs ``python -X importtime -c "import app.main"`` in a fresh interpreter and
+fails if any of the heavy client libraries are imported eagerly, or if the
+cumulative import time of ``app.main`` exceeds the budget.
+
+Usage:
+    python scripts/import_time.py [--budget-ms 800] [--top 15]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.warmup import HEAVY_MODULES  # noqa: E402
+
+# Settings are required at import time; dummy values are enough to import.
+DUMMY_ENV = {
+    "SECRET_KEY": "import-time-benchmark",
+    "GOOGLE_CLIENT_ID": "import-time-benchmark",
+    "GOOGLE_CLIENT_SECRET": "import-time-benchmark",
+    "ANTHROPIC_API_KEY": "import-time-benchmark",
+    "TOKEN_ENCRYPTION_KEY": "import-time-benchmark",
+}
+
+
+def measure_imports(module: str) -> dict[str, int]:
+    """Return cumulative import time in microseconds per imported module."""
+    env = {**DUMMY_ENV, **os.environ}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"Importing {module} failed:\n{result.stderr}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--budget-ms", type=float, default=800.0)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    timings = measure_imports(args.module)
+    total_ms = timings.get(args.module, 0) / 1000
+
+    print(f"{args.module}: {total_ms:.1f} ms cumulative")
+    for name, micros in sorted(timings.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+
+    eager = [name for name in HEAVY_MODULES if name in timings]
+    if eager:
+        print(f"FAIL: heavy modules imported eagerly: {', '.join(eager)}")
+        return 1
+    if total_ms > args.budget_ms:
+        print(f"FAIL: import time {total_ms:.1f} ms exceeds budget {args.budget_ms:.1f} ms")
+        return 1
+
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
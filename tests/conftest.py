@@ -0,0 +1,36 @@
+import asyncio
+import os
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+# Settings are required at import time; dummy values are enough for tests.
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("GOOGLE_CLIENT_ID", "test")
+os.environ.setdefault("GOOGLE_CLIENT_SECRET", "test")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+os.environ.setdefault("TOKEN_ENCRYPTION_KEY", "test")
+
+
+@pytest.fixture
+def run():
+    """Run coroutines on one event loop for the duration of a test."""
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+@pytest.fixture
+def session_maker(run):
+    """Session factory for a fresh in-memory database with all tables."""
+    from app.db.database import Base
+
+    engine = create_async_engine("sqlite+aiosqlite://")
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    run(create_tables())
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    run(engine.dispose())
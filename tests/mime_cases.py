@@ -0,0 +1,159 @@
+"""
+MIME messages for body extraction tests and benchmarks.
+
+``load_message`` converts a raw message into a Gmail API payload (the shape
+returned by ``messages.get`` with ``format=full``), so the parser can be
+exercised without the Gmail API. Used by ``tests/test_mime.py`` and
+``scripts/bench_mime.py``.
+"""
+import base64
+import email
+import email.policy
+
+# Bodies at least this large are stored under an attachmentId by Gmail in
+# the converted payloads, to exercise the follow-up fetch.
+ATTACHMENT_BODY_THRESHOLD = 4000
+
+PLAIN = "text/plain; charset=utf-8"
+HTML = "text/html; charset=utf-8"
+
+# (name, raw message, text the body must contain, text it must not contain)
+CASES = [
+    (
+        "plain only",
+        f"Content-Type: {PLAIN}\n\nThe quarterly report is attached below.\n",
+        "quarterly report",
+        None,
+    ),
+    (
+        "html only",
+        f"Content-Type: {HTML}\n\n<html><body><p>Your order has shipped.</p>"
+        "<style>p {{color: red}}</style></body></html>\n",
+        "Your order has shipped.",
+        "color: red",
+    ),
+    (
+        "alternative",
+        'Content-Type: multipart/alternative; boundary="a"\n\n'
+        f"--a\nContent-Type: {HTML}\n\n<p>HTML version</p>\n"
+        f"--a\nContent-Type: {PLAIN}\n\nPlain version\n"
+        "--a--\n",
+        "Plain version",
+        "HTML version",
+    ),
+    (
+        "mixed with nested alternative and html sibling",
+        'Content-Type: multipart/mixed; boundary="m"\n\n'
+        "--m\n"
+        'Content-Type: multipart/alternative; boundary="a"\n\n'
+        f"--a\nContent-Type: {PLAIN}\n\nMeeting moved to Thursday.\n"
+        f"--a\nContent-Type: {HTML}\n\n<p>Meeting moved to Thursday.</p>\n"
+        "--a--\n"
+        f"--m\nContent-Type: {HTML}\n\n<p>Mailing list footer</p>\n"
+        "--m--\n",
+        "Meeting moved to Thursday.",
+        "footer",
+    ),
+    (
+        "related html with inline image",
+        'Content-Type: multipart/related; boundary="r"\n\n'
+        f"--r\nContent-Type: {HTML}\n\n<p>Newsletter <img src=\"cid:logo\"></p>\n"
+        "--r\nContent-Type: image/png\nContent-ID: <logo>\n"
+        "Content-Transfer-Encoding: base64\n\niVBORw0KGgo=\n"
+        "--r--\n",
+        "Newsletter",
+        None,
+    ),
+    (
+        "text attachment before body",
+        'Content-Type: multipart/mixed; boundary="m"\n\n'
+        f"--m\nContent-Type: {PLAIN}\n"
+        'Content-Disposition: attachment; filename="notes.txt"\n\n'
+        "Attached notes, not the body\n"
+        f"--m\nContent-Type: {PLAIN}\n\nSee the attached notes.\n"
+        "--m--\n",
+        "See the attached notes.",
+        "not the body",
+    ),
+    (
+        "deeply nested alternative",
+        'Content-Type: multipart/mixed; boundary="m"\n\n'
+        "--m\n"
+        'Content-Type: multipart/related; boundary="r"\n\n'
+        "--r\n"
+        'Content-Type: multipart/alternative; boundary="a"\n\n'
+        f"--a\nContent-Type: {HTML}\n\n<p>Invoice 42 is due</p>\n"
+        f"--a\nContent-Type: {PLAIN}\n\nInvoice 42 is due on May 1.\n"
+        "--a--\n"
+        "--r--\n"
+        "--m\nContent-Type: application/pdf\n"
+        'Content-Disposition: attachment; filename="invoice.pdf"\n'
+        "Content-Transfer-Encoding: base64\n\nJVBERi0xLjQ=\n"
+        "--m--\n",
+        "Invoice 42 is due on May 1.",
+        None,
+    ),
+    (
+        "calendar invite",
+        'Content-Type: multipart/mixed; boundary="m"\n\n'
+        "--m\n"
+        'Content-Type: multipart/alternative; boundary="a"\n\n'
+        f"--a\nContent-Type: {HTML}\n\n<p>You have been invited to Standup</p>\n"
+        "--a\nContent-Type: text/calendar; method=REQUEST\n\nBEGIN:VCALENDAR\nEND:VCALENDAR\n"
+        "--a--\n"
+        "--m--\n",
+        "You have been invited to Standup",
+        "VCALENDAR",
+    ),
+    (
+        "body stored as attachment",
+        'Content-Type: multipart/alternative; boundary="a"\n\n'
+        f"--a\nContent-Type: {PLAIN}\n\n" + "Long release notes line.\n" * 200
+        + f"--a\nContent-Type: {HTML}\n\n<p>Short HTML preview</p>\n"
+        "--a--\n",
+        "Long release notes line.",
+        "Short HTML preview",
+    ),
+]
+
+
+def to_gmail_payload(part, attachments: dict[str, str], counter: list[int]) -> dict:
+    """
+    Convert a parsed MIME part into a Gmail API payload.
+
+    Large leaf bodies get an ``attachmentId`` instead of inline data, and
+    their data is stored in ``attachments``, as Gmail does.
+    """
+    headers = [{"name": name, "value": str(value)} for name, value in part.items()]
+    payload = {
+        "mimeType": part.get_content_type(),
+        "filename": part.get_filename() or "",
+        "headers": headers,
+        "body": {"size": 0},
+    }
+    if part.is_multipart():
+        payload["parts"] = [
+            to_gmail_payload(child, attachments, counter)
+            for child in part.iter_parts()
+        ]
+        return payload
+
+    content = part.get_payload(decode=True) or b""
+    data = base64.urlsafe_b64encode(content).decode()
+    payload["body"]["size"] = len(content)
+    if len(content) >= ATTACHMENT_BODY_THRESHOLD:
+        counter[0] += 1
+        attachment_id = f"attachment-{counter[0]}"
+        payload["body"]["attachmentId"] = attachment_id
+        attachments[attachment_id] = data
+    else:
+        payload["body"]["data"] = data
+    return payload
+
+
+def load_message(raw: bytes) -> tuple[dict, dict[str, str]]:
+    """Parse a raw message into a Gmail payload and its attachment data."""
+    message = email.message_from_bytes(raw, policy=email.policy.default)
+    attachments = {}
+    payload = to_gmail_payload(message, attachments, [0])
+    return payload, attachments
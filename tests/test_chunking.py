@@ -0,0 +1,27 @@
+from app.summarizer.chunking import split_into_at_most, split_into_chunks
+
+
+def paragraphs(count: int, length: int = 500) -> str:
+    return "\n\n".join(f"Paragraph {i}. " + "x" * length for i in range(count))
+
+
+def test_chunks_respect_max_size():
+    chunks = split_into_chunks(paragraphs(20), 1200)
+    assert all(len(chunk) <= 1200 for chunk in chunks)
+    assert "Paragraph 19." in chunks[-1]
+
+
+def test_long_text_is_covered_by_max_chunks():
+    text = paragraphs(60)  # about 31k characters
+    chunks, dropped = split_into_at_most(text, 4, 2500, 40000)
+    assert len(chunks) <= 4
+    assert dropped == 0
+    assert "Paragraph 59." in chunks[-1]
+
+
+def test_only_text_beyond_max_chars_is_dropped():
+    text = paragraphs(60)
+    chunks, dropped = split_into_at_most(text, 2, 2500, 5000)
+    assert len(chunks) == 2
+    assert dropped > 0
+    assert "Paragraph 0." in chunks[0]
@@ -0,0 +1,78 @@
+from app.summarizer.compaction import compact_text
+
+
+def test_forwarded_message_is_kept():
+    body = (
+        "FYI, see below.\n\n"
+        "---------- Forwarded message ---------\n"
+        "From: Ops <ops@example.com>\n"
+        "Date: Mon, Jan 1, 2024 at 9:00 AM\n"
+        "Subject: Outage\n"
+        "To: <team@example.com>\n\n"
+        "The database migration is scheduled for Saturday at 02:00 UTC.\n"
+    )
+    compacted = compact_text(body)
+    assert "FYI, see below." in compacted
+    assert "database migration is scheduled for Saturday" in compacted
+
+
+def test_ordinary_sentences_are_kept():
+    body = (
+        "The offsite is on June 3.\n\n"
+        "If you are not able to attend, tell Dana by Friday.\n\n"
+        "Please review the terms and conditions of the new vendor contract "
+        "before we sign it next week."
+    )
+    compacted = compact_text(body)
+    assert "If you are not able to attend, tell Dana by Friday." in compacted
+    assert "terms and conditions of the new vendor contract" in compacted
+
+
+def test_footer_block_is_removed():
+    body = (
+        "Our spring sale starts Monday with 30% off all jackets.\n\n"
+        "You're receiving this email because you signed up at acme.com.\n"
+        "Unsubscribe | Manage preferences\n\n"
+        "Acme Inc\n"
+        "123 Main St, Springfield\n\n"
+        "Privacy Policy | Terms of Service\n"
+        "© 2024 Acme Inc. All rights reserved."
+    )
+    compacted = compact_text(body)
+    assert compacted == "Our spring sale starts Monday with 30% off all jackets."
+
+
+def test_legal_disclaimer_is_removed():
+    body = (
+        "Attached is the signed NDA.\n\n"
+        "Thanks,\nSam\n\n"
+        "This email and any attachments are confidential. If you are not the "
+        "intended recipient, please delete it."
+    )
+    compacted = compact_text(body)
+    assert "signed NDA" in compacted
+    assert "Sam" in compacted
+    assert "confidential" not in compacted
+
+
+def test_reply_chain_is_removed():
+    body = (
+        "Sounds good, see you then.\n\n"
+        "On Mon, Jan 1, 2024 at 9:00 AM Bob <bob@example.com> wrote:\n"
+        "> Lunch at noon?\n"
+    )
+    assert compact_text(body) == "Sounds good, see you then."
+
+
+def test_reply_to_a_forward_drops_the_quoted_forward():
+    body = (
+        "Thanks, I will take a look.\n\n"
+        "From: Sam <sam@example.com>\n"
+        "Sent: Monday, January 1, 2024 9:00 AM\n"
+        "Subject: FW: Outage\n\n"
+        "---------- Forwarded message ---------\n"
+        "From: Ops <ops@example.com>\n"
+        "Date: Mon, Jan 1, 2024 at 8:00 AM\n\n"
+        "The database migration is scheduled for Saturday.\n"
+    )
+    assert compact_text(body) == "Thanks, I will take a look."
@@ -0,0 +1,96 @@
+import asyncio
+import base64
+
+from app.gmail import service
+from app.gmail.parser import extract_body
+from app.resilience import CircuitOpenError
+
+
+def encode(text: str) -> str:
+    return base64.urlsafe_b64encode(text.encode()).decode()
+
+
+PAYLOAD = {
+    "mimeType": "multipart/alternative",
+    "parts": [
+        {"mimeType": "text/plain", "body": {"attachmentId": "att-1", "size": 9000}},
+        {"mimeType": "text/html", "body": {"data": encode("<p>Short preview</p>")}},
+    ],
+}
+
+
+class FakeService:
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def attachments(self):
+        return self
+
+    def get(self, **kwargs):
+        return kwargs
+
+
+def test_failed_attachment_batch_falls_back_to_inline_part(monkeypatch):
+    async def failing_batch(gmail_service, requests):
+        raise CircuitOpenError("gmail circuit is open")
+
+    monkeypatch.setattr(service, "execute_batch", failing_batch)
+    messages = [{"id": "m1", "payload": PAYLOAD}]
+    attachment_data = asyncio.run(service.fetch_attachment_bodies(FakeService(), messages))
+
+    assert attachment_data == {}
+    assert extract_body(PAYLOAD, attachment_data) == "Short preview"
+
+
+def test_attachment_bodies_are_resolved(monkeypatch):
+    async def batch(gmail_service, requests):
+        return [{"data": encode("Full release notes")} for _ in requests]
+
+    monkeypatch.setattr(service, "execute_batch", batch)
+    messages = [{"id": "m1", "payload": PAYLOAD}]
+    attachment_data = asyncio.run(service.fetch_attachment_bodies(FakeService(), messages))
+
+    assert extract_body(PAYLOAD, attachment_data) == "Full release notes"
+
+
+def make_message(message_id: str, timestamp: int, body: str) -> dict:
+    return {
+        "id": message_id,
+        "internalDate": str(timestamp * 1000),
+        "payload": {
+            "mimeType": "text/plain",
+            "headers": [{"name": "From", "value": "Sam <sam@example.com>"}],
+            "body": {"data": encode(body)},
+        },
+    }
+
+
+def test_thread_keeps_forwarded_messages():
+    from app.gmail.parser import extract_thread_content
+
+    thread = {
+        "id": "t1",
+        "messages": [
+            make_message("m1", 1, (
+                "FYI, see below.\n\n"
+                "---------- Forwarded message ---------\n"
+                "From: Ops <ops@example.com>\n"
+                "Date: Mon, Jan 1, 2024 at 9:00 AM\n"
+                "Subject: Outage\n"
+                "To: <team@example.com>\n\n"
+                "The database migration is scheduled for Saturday.\n"
+            )),
+            make_message("m2", 2, (
+                "Thanks, noted.\n\n"
+                "On Mon, Jan 1, 2024 at 9:05 AM Sam <sam@example.com> wrote:\n"
+                "> FYI, see below.\n"
+            )),
+        ],
+    }
+    body = extract_thread_content(thread)["body"]
+    assert "database migration is scheduled for Saturday" in body
+    assert "Thanks, noted." in body
+    assert body.count("FYI, see below.") == 1
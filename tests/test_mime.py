@@ -0,0 +1,17 @@
+import pytest
+
+from app.gmail.parser import extract_body
+from tests.mime_cases import CASES, load_message
+
+
+@pytest.mark.parametrize(
+    "raw, expected, unexpected",
+    [case[1:] for case in CASES],
+    ids=[case[0] for case in CASES],
+)
+def test_extract_body_picks_the_body_part(raw, expected, unexpected):
+    payload, attachments = load_message(raw.encode())
+    body = extract_body(payload, attachments)
+    assert expected in body
+    if unexpected is not None:
+        assert unexpected not in body
@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+
+from app.metrics import metrics
+from app.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceededError,
+    RetryBudget,
+    call_with_retries,
+    hedged,
+)
+
+
+class Transient(Exception):
+    pass
+
+
+def is_transient(error: Exception) -> bool:
+    return isinstance(error, Transient)
+
+
+def failing(error: Exception):
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        raise error
+
+    return fn, calls
+
+
+def counter(name: str, **labels) -> float:
+    label_text = ",".join(f"{key}={value}" for key, value in sorted(labels.items()))
+    return metrics.snapshot()["counters"].get(f"{name}{{{label_text}}}", 0)
+
+
+def test_retries_stop_at_max_retries():
+    fn, calls = failing(Transient())
+    with pytest.raises(Transient):
+        asyncio.run(call_with_retries(fn, "test", is_transient, max_retries=2, base_delay=0))
+    assert len(calls) == 3
+
+
+def test_retries_stop_when_budget_is_spent():
+    fn, calls = failing(Transient())
+    budget = RetryBudget("test", ratio=0, min_retries=1)
+    with pytest.raises(Transient):
+        asyncio.run(call_with_retries(
+            fn, "test", is_transient, max_retries=5, base_delay=0, budget=budget
+        ))
+    assert len(calls) == 2
+
+
+def test_non_transient_error_is_raised_at_once_and_ignored_by_breaker():
+    fn, calls = failing(ValueError("bad request"))
+    breaker = CircuitBreaker("test", failure_threshold=1)
+    with pytest.raises(ValueError):
+        asyncio.run(call_with_retries(
+            fn, "test", is_transient, max_retries=3, base_delay=0, breaker=breaker
+        ))
+    assert len(calls) == 1
+    assert breaker.state == CLOSED
+
+
+def test_breaker_opens_half_opens_and_closes():
+    async def main():
+        breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=0.05)
+        fn, calls = failing(Transient())
+        for _ in range(2):
+            with pytest.raises(Transient):
+                await call_with_retries(fn, "test", is_transient, 0, 0, breaker=breaker)
+        assert breaker.state == OPEN
+
+        with pytest.raises(CircuitOpenError):
+            await call_with_retries(fn, "test", is_transient, 0, 0, breaker=breaker)
+        assert len(calls) == 2
+
+        await asyncio.sleep(0.06)
+        release = asyncio.Event()
+
+        async def trial():
+            await release.wait()
+            return "ok"
+
+        trial_task = asyncio.create_task(
+            call_with_retries(trial, "test", is_transient, 0, 0, breaker=breaker)
+        )
+        await asyncio.sleep(0)
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            await call_with_retries(trial, "test", is_transient, 0, 0, breaker=breaker)
+
+        release.set()
+        assert await trial_task == "ok"
+        assert breaker.state == CLOSED
+
+    asyncio.run(main())
+
+
+def test_deadline_overrun_raises_and_is_counted():
+    async def slow():
+        await asyncio.sleep(1)
+
+    before = counter("timeouts", call="deadline-test")
+    with pytest.raises(DeadlineExceededError):
+        asyncio.run(call_with_retries(
+            slow, "deadline-test", is_transient, max_retries=0, base_delay=0, timeout=0.01
+        ))
+    assert counter("timeouts", call="deadline-test") == before + 1
+
+
+def test_hedged_returns_first_success_and_cancels_the_loser():
+    async def main():
+        started = []
+        cancelled = []
+
+        async def fn():
+            attempt = len(started)
+            started.append(attempt)
+            try:
+                # The first call is slow, the hedge answers quickly
+                await asyncio.sleep(1 if attempt == 0 else 0.01)
+            except asyncio.CancelledError:
+                cancelled.append(attempt)
+                raise
+            return attempt
+
+        result = await hedged(fn, delay=0.02, name="hedge-test")
+        await asyncio.sleep(0)
+        return result, started, cancelled
+
+    result, started, cancelled = asyncio.run(main())
+    assert result == 1
+    assert started == [0, 1]
+    assert cancelled == [0]
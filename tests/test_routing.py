@@ -0,0 +1,54 @@
+from app.config import get_settings
+from app.summarizer.routing import (
+    EXTRACTIVE,
+    FAST,
+    MAX_OUTPUT_TOKENS,
+    STANDARD,
+    SUMMARY_TAG_TOKENS,
+    output_budget,
+    route_email,
+)
+
+settings = get_settings()
+
+
+def make_email(length: int, subject: str = "Team update") -> dict:
+    return {"subject": subject, "body": "x" * length}
+
+
+def test_trivial_emails_are_extractive():
+    assert route_email(make_email(settings.trivial_max_chars), 2) == EXTRACTIVE
+    assert route_email(make_email(settings.trivial_max_chars + 1), 2) == FAST
+
+
+def test_short_receipts_are_extractive():
+    receipt = make_email(settings.receipt_max_chars, "Your receipt from Example Store")
+    assert route_email(receipt, 2) == EXTRACTIVE
+
+    long_receipt = make_email(settings.receipt_max_chars + 1, "Your receipt from Example Store")
+    assert route_email(long_receipt, 2) == FAST
+
+
+def test_long_emails_go_to_the_standard_model():
+    assert route_email(make_email(settings.standard_min_chars - 1), 2) == FAST
+    assert route_email(make_email(settings.standard_min_chars), 2) == STANDARD
+
+
+def test_long_summaries_go_to_the_standard_model():
+    email = make_email(settings.trivial_max_chars + 1)
+    assert route_email(email, settings.standard_min_lines - 1) == FAST
+    assert route_email(email, settings.standard_min_lines) == STANDARD
+
+
+def test_output_budget_is_capped_by_body_size():
+    per_line = settings.tokens_per_summary_line
+    short = make_email(40)  # 10 tokens
+    assert output_budget([short], 3) == 10 + per_line + SUMMARY_TAG_TOKENS
+
+    long = make_email(4000)
+    assert output_budget([long], 3) == 3 * per_line + SUMMARY_TAG_TOKENS
+
+
+def test_output_budget_is_capped_by_max_output_tokens():
+    emails = [make_email(4000) for _ in range(100)]
+    assert output_budget(emails, 10) == MAX_OUTPUT_TOKENS
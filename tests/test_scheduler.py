@@ -0,0 +1,45 @@
+import asyncio
+
+from app.summarizer.scheduler import FairScheduler
+
+
+def test_cancel_then_release_keeps_capacity():
+    async def main():
+        scheduler = FairScheduler(max_concurrent=1, quantum=100)
+        await scheduler.acquire("a", 10)
+
+        waiter = asyncio.create_task(scheduler.acquire("b", 10))
+        await asyncio.sleep(0)
+        # Cancel the waiter and release before its task gets to run again
+        waiter.cancel()
+        scheduler.release()
+
+        assert scheduler.active == 0
+        await asyncio.wait_for(scheduler.acquire("c", 10), timeout=1)
+        assert scheduler.active == 1
+        assert waiter.cancelled() or waiter.done()
+
+    asyncio.run(main())
+
+
+def test_small_user_is_not_starved():
+    async def main():
+        scheduler = FairScheduler(max_concurrent=1, quantum=100)
+        order = []
+
+        async def call(user_id, cost):
+            async with scheduler.slot(user_id, cost):
+                order.append(user_id)
+                await asyncio.sleep(0)
+
+        await scheduler.acquire("hold", 1)
+        tasks = [asyncio.create_task(call("big", 300)) for _ in range(3)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(call("small", 50)))
+        await asyncio.sleep(0)
+        scheduler.release()
+        await asyncio.gather(*tasks)
+
+        assert order.index("small") < len(order) - 1
+
+    asyncio.run(main())
@@ -0,0 +1,34 @@
+from sqlalchemy import func, select, text
+
+from app.db.models import IndexedEmail
+from app.search import index
+
+
+def test_index_emails_skips_emails_indexed_concurrently(session_maker, run, monkeypatch):
+    monkeypatch.setattr(index, "_search_available", True)
+    emails = [
+        {"id": "m1", "subject": "Launch", "body": "Launch moved to Friday"},
+        {"id": "m2", "subject": "Lunch", "body": "Lunch at noon"},
+    ]
+
+    async def main():
+        async with session_maker() as db:
+            await db.execute(text(index._CREATE_INDEX))
+            await index.index_emails(db, 1, emails[:1])
+            await db.commit()
+
+        # Another run indexed m1 after this run checked for indexed emails
+        async def nothing_indexed(*args):
+            return set()
+
+        monkeypatch.setattr(index, "get_indexed_message_ids", nothing_indexed)
+        async with session_maker() as db:
+            added = await index.index_emails(db, 1, emails)
+            await db.commit()
+
+        async with session_maker() as db:
+            count = await db.scalar(select(func.count()).select_from(IndexedEmail))
+            rows = await db.scalar(text("SELECT count(*) FROM email_search"))
+        return added, count, rows
+
+    assert run(main()) == (1, 2, 2)
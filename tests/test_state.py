@@ -0,0 +1,121 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from app.singleflight import SharedSingleFlight
+from app.state import backend as state_backend
+from app.state.memory import InMemoryBackend
+
+
+def make_redis_backend():
+    """Redis backend against TEST_REDIS_URL, or an in-process stand-in."""
+    from app.state.redis_backend import RedisBackend
+
+    url = os.environ.get("TEST_REDIS_URL")
+    if url:
+        return RedisBackend(url, prefix="email-summarizer-test:")
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    return RedisBackend("", client=fakeredis.aioredis.FakeRedis())
+
+
+@pytest.fixture(params=["memory", "redis"])
+def make_backend(request):
+    if request.param == "memory":
+        return InMemoryBackend
+    pytest.importorskip("redis")
+    return make_redis_backend
+
+
+def run(make_backend, test):
+    async def main():
+        backend = make_backend()
+        try:
+            await test(backend)
+        finally:
+            await backend.close()
+
+    asyncio.run(main())
+
+
+def test_set_get_and_expiry(make_backend):
+    async def test(backend):
+        await backend.delete("key")
+        assert await backend.set("key", b"value", ttl=0.2, only_if_absent=True)
+        assert not await backend.set("key", b"other", only_if_absent=True)
+        assert await backend.get("key") == b"value"
+        await asyncio.sleep(0.3)
+        assert await backend.get("key") is None
+
+    run(make_backend, test)
+
+
+def test_lock_release_requires_token(make_backend):
+    async def test(backend):
+        await backend.delete("lock")
+        assert await backend.acquire_lock("lock", b"a", 10)
+        assert not await backend.acquire_lock("lock", b"b", 10)
+        assert not await backend.release_lock("lock", b"b")
+        assert await backend.release_lock("lock", b"a")
+        assert await backend.acquire_lock("lock", b"b", 10)
+        await backend.release_lock("lock", b"b")
+
+    run(make_backend, test)
+
+
+def test_token_bucket(make_backend):
+    async def test(backend):
+        await backend.delete("bucket")
+        assert await backend.take_tokens("bucket", 2, 1) == 0
+        assert await backend.take_tokens("bucket", 2, 1) == 0
+        wait = await backend.take_tokens("bucket", 2, 1)
+        assert 0 < wait <= 1
+
+    run(make_backend, test)
+
+
+def test_queue_is_fifo(make_backend):
+    async def test(backend):
+        while await backend.dequeue("jobs", timeout=0.1) is not None:
+            pass
+        await backend.enqueue("jobs", b"1")
+        await backend.enqueue("jobs", b"2")
+        assert await backend.dequeue("jobs", timeout=1) == b"1"
+        assert await backend.dequeue("jobs", timeout=1) == b"2"
+
+    run(make_backend, test)
+
+
+def test_shared_single_flight_coalesces_across_instances(make_backend, monkeypatch):
+    async def test(backend):
+        monkeypatch.setattr(state_backend, "get_state_backend", lambda: backend)
+        runs = 0
+
+        async def work():
+            nonlocal runs
+            runs += 1
+            await asyncio.sleep(0.3)
+            return {"run": runs}
+
+        def make_flight():
+            # Separate instances stand in for separate worker processes
+            return SharedSingleFlight(
+                "test",
+                dumps=lambda result: json.dumps(result).encode(),
+                loads=json.loads,
+                lock_ttl=10,
+                poll_interval=0.05,
+            )
+
+        first, second = make_flight(), make_flight()
+        key = ("user", os.getpid(), id(backend))
+        results = await asyncio.gather(first.do(key, work), second.do(key, work))
+        assert runs == 1
+        assert results == [{"run": 1}, {"run": 1}]
+
+        # A later call is a new run, not a stale result
+        assert await second.do(key, work) == {"run": 2}
+
+    run(make_backend, test)
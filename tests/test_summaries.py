@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import func, select
+
+from app.db.models import SummaryRecord
+from app.summaries import service
+
+
+def make_summary(message_id: str) -> dict:
+    return {
+        "id": message_id,
+        "subject": "Subject",
+        "date": "2024-01-01",
+        "snippet": "Snippet",
+        "summary": "Summary",
+    }
+
+
+def test_store_summaries_skips_rows_stored_concurrently(session_maker, run, monkeypatch):
+    emails = [{"id": "m1", "timestamp": 1}, {"id": "m2", "timestamp": 2}]
+    summaries = [make_summary("m1"), make_summary("m2")]
+
+    async def main():
+        # Another run stored m1 after this run checked for stored summaries
+        async with session_maker() as db:
+            await service.store_summaries(db, 1, "a@b.c", 2, emails[:1], summaries[:1])
+            await db.commit()
+
+        async def nothing_stored(*args):
+            return set()
+
+        monkeypatch.setattr(service, "get_stored_message_ids", nothing_stored)
+        async with session_maker() as db:
+            added = await service.store_summaries(db, 1, "a@b.c", 2, emails, summaries)
+            await db.commit()
+            count = await db.scalar(select(func.count()).select_from(SummaryRecord))
+        return added, count
+
+    assert run(main()) == (1, 2)
+
+
+def test_summary_pages_are_newest_first_by_received_time(session_maker, run):
+    # A later sync can store older emails than an earlier one
+    syncs = [
+        [{"id": "m1", "timestamp": 300}, {"id": "m3"}],
+        [{"id": "m2", "timestamp": 100}, {"id": "m4", "timestamp": 200},
+         {"id": "m5", "timestamp": 300}],
+    ]
+
+    async def main():
+        async with session_maker() as db:
+            for emails in syncs:
+                summaries = [make_summary(email["id"]) for email in emails]
+                await service.store_summaries(db, 1, "a@b.c", 2, emails, summaries)
+            await db.commit()
+
+            pages = []
+            cursor = None
+            while True:
+                records, cursor = await service.list_summaries_page(db, 1, 2, cursor)
+                pages.append([record.message_id for record in records])
+                if cursor is None:
+                    return pages
+
+    assert run(main()) == [["m5", "m1"], ["m4", "m2"], ["m3"]]
+
+
+def test_malformed_cursor_is_rejected(session_maker, run):
+    async def main():
+        async with session_maker() as db:
+            await service.list_summaries_page(db, 1, 2, "not-a-cursor")
+
+    with pytest.raises(service.InvalidCursorError):
+        run(main())
@@ -0,0 +1,65 @@
+import asyncio
+from types import SimpleNamespace
+
+import anthropic
+import httpx
+import pytest
+
+from app.summarizer import service
+
+
+def make_email(number: int) -> dict:
+    return {
+        "id": f"fallback-{number}",
+        "subject": f"Project update {number}",
+        "body": f"Project update {number}. " + "The rollout continues as planned. " * 15,
+    }
+
+
+def api_error(error_class, status_code: int) -> anthropic.APIStatusError:
+    request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+    response = httpx.Response(status_code, request=request)
+    return error_class("failed", response=response, body=None)
+
+
+def fake_model(first_error: Exception):
+    """Fail the first batch with ``first_error``, answer every later one."""
+    calls = []
+
+    async def create_message_with_retries(client, route, prompt, *args, **kwargs):
+        calls.append(prompt)
+        if len(calls) == 1:
+            raise first_error
+        count = prompt.count("Project update") // 2
+        text = "".join(f"[SUMMARY {n}] Model summary [/SUMMARY {n}]" for n in range(1, count + 1))
+        return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+    return create_message_with_retries
+
+
+@pytest.fixture
+def summarizer(monkeypatch):
+    # Skip the pause between batches
+    monkeypatch.setattr(service, "rate_limits_enabled", lambda: True)
+
+    def summarize(first_error: Exception) -> list[dict]:
+        monkeypatch.setattr(service, "create_message_with_retries", fake_model(first_error))
+        emails = [make_email(number) for number in range(6)]
+        return asyncio.run(service.summarize_emails(emails, 2, "sender@example.com"))
+
+    return summarize
+
+
+def test_rate_limited_batch_falls_back_and_keeps_other_batches(summarizer):
+    results = summarizer(api_error(anthropic.RateLimitError, 429))
+
+    assert len(results) == 6
+    assert all(result["degraded"] for result in results[:5])
+    assert all(result["summary"] != "Model summary" for result in results[:5])
+    assert not results[5]["degraded"]
+    assert results[5]["summary"] == "Model summary"
+
+
+def test_bad_request_is_raised_instead_of_falling_back(summarizer):
+    with pytest.raises(service.SummarizationError):
+        summarizer(api_error(anthropic.BadRequestError, 400))
@@ -0,0 +1,19 @@
+from app.summaries.service import store_summaries
+from app.watch.service import get_precomputed_summaries
+
+
+def test_precomputed_summaries_exclude_threads(session_maker, run):
+    emails = [{"id": "m1", "timestamp": 1}, {"id": "thread:t1", "timestamp": 2}]
+    summaries = [
+        {"id": email["id"], "subject": "S", "date": "", "snippet": "", "summary": "x"}
+        for email in emails
+    ]
+
+    async def main():
+        async with session_maker() as db:
+            await store_summaries(db, 1, "a@b.c", 2, emails, summaries)
+            await db.commit()
+            precomputed = await get_precomputed_summaries(db, 1, "a@b.c", 2, limit=10)
+        return [summary["id"] for summary in precomputed]
+
+    assert run(main()) == ["m1"]